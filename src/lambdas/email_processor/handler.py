@@ -5,6 +5,7 @@ Receives SQS messages containing SES notifications, downloads and processes emai
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
@@ -24,6 +25,10 @@ db_client = DynamoDBClient()
 ai_client = AIClient()
 email_parser = EmailParser()
 
+# Shared executor so attachment uploads overlap the AI extraction call;
+# reused across warm invocations
+upload_executor = ThreadPoolExecutor(max_workers=4)
+
 
 def lambda_handler(event, context):
     """Process incoming emails from SQS queue.
@@ -90,53 +95,57 @@ def process_email_record(record):
     # Download email from S3
     raw_email = s3_client.get_email(object_key)
     
-    # Parse email
-    msg = email_parser.parse_raw_email(raw_email)
-    metadata = email_parser.extract_metadata(msg)
-    body = email_parser.extract_body(msg)
-    attachments = email_parser.extract_attachments(msg)
-    
+    # Header-only pre-parse: auto-replies and disallowed senders are
+    # rejected on O(header bytes) work, before the full multipart parse
+    # ever touches the body or decodes attachments
+    headers = email_parser.parse_headers_only(raw_email)
+    metadata = email_parser.extract_metadata(headers)
+
     # Skip auto-replies
-    if email_parser.is_auto_reply(msg):
+    if email_parser.is_auto_reply(headers):
         logger.info("Skipping auto-reply email")
         return
-    
+
     # Validate sender if allowlist is enabled
     if Config.ENABLE_EMAIL_ALLOWLIST:
-        allowed_domains = [d.strip() for d in Config.ALLOWED_SENDER_DOMAINS.split(',') if d.strip()]
-        if not email_parser.validate_sender(metadata['sender_email'], allowed_domains):
+        if not email_parser.validate_sender(metadata['sender_email'], Config.ALLOWED_SENDER_DOMAINS):
             logger.warning(f"Rejected email from unauthorized sender: {metadata['sender_email']}")
             return
-    
-    # Store attachments in S3
-    attachment_keys = []
+
+    # Full parse only for emails that passed the header checks
+    msg = email_parser.parse_raw_email(raw_email)
+    body = email_parser.extract_body(msg)
+    attachments = email_parser.extract_attachments(msg)
+
+    # Start attachment uploads in the background; they are independent of
+    # the AI extraction call below, so the two I/O waits overlap
+    max_size = Config.MAX_ATTACHMENT_SIZE_MB * 1024 * 1024
+    to_store = []
     for attachment in attachments:
         # Check size limit
-        max_size = Config.MAX_ATTACHMENT_SIZE_MB * 1024 * 1024
         if attachment['size'] > max_size:
             logger.warning(f"Attachment {attachment['filename']} exceeds size limit: {attachment['size']} bytes")
             continue
-        
-        try:
-            key = f"{metadata['message_id']}/{attachment['filename']}"
-            stored_key = s3_client.store_attachment(key, attachment['data'], attachment['content_type'])
-            attachment_keys.append({
-                'filename': attachment['filename'],
-                's3_key': stored_key,
-                'content_type': attachment['content_type'],
-                'size': attachment['size']
-            })
-        except Exception as e:
-            logger.error(f"Failed to store attachment {attachment['filename']}: {str(e)}")
-    
+        to_store.append(attachment)
+
+    upload_futures = [
+        (attachment, upload_executor.submit(
+            s3_client.store_attachment,
+            f"{metadata['message_id']}/{attachment['filename']}",
+            attachment['data'],
+            attachment['content_type']
+        ))
+        for attachment in to_store
+    ]
+
     # Prepare attachment summary for AI
     attachments_summary = None
-    if attachment_keys:
+    if to_store:
         attachments_summary = ", ".join([
-            f"{a['filename']} ({a['content_type']})" for a in attachment_keys
+            f"{a['filename']} ({a['content_type']})" for a in to_store
         ])
-    
-    # Extract project information using AI
+
+    # Extract project information using AI while uploads are in flight
     logger.info("Extracting project data with AI")
     sanitized_body = ai_client.sanitize_input(body)
     extracted_data = ai_client.extract_project_data(
@@ -145,6 +154,20 @@ def process_email_record(record):
         body=sanitized_body,
         attachments_summary=attachments_summary
     )
+
+    # Collect upload results before recording the event
+    attachment_keys = []
+    for attachment, future in upload_futures:
+        try:
+            stored_key = future.result()
+            attachment_keys.append({
+                'filename': attachment['filename'],
+                's3_key': stored_key,
+                'content_type': attachment['content_type'],
+                'size': attachment['size']
+            })
+        except Exception as e:
+            logger.error(f"Failed to store attachment {attachment['filename']}: {str(e)}")
     
     # Determine or create project ID
     project_id = determine_project_id(metadata, extracted_data)
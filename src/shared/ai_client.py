@@ -1,13 +1,146 @@
 """OpenAI client wrapper for AI operations."""
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import re
+import threading
 import boto3
 from typing import Dict, Any, Optional, List
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from .caching import TTLCache
 from .config import Config
+from .fastjson import loads as _json_loads
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Shared OpenAI client (reused across AIClient instances so warm Lambda
+# invocations keep the same HTTPS connection pool instead of paying TLS
+# setup on every request)
+_client_lock = threading.Lock()
+_client_cache: Optional[tuple] = None  # (OpenAI class, api_key, client)
+_async_client_cache: Optional[tuple] = None  # (AsyncOpenAI class, api_key, client)
+
+# Cap concurrent OpenAI requests so bursts stay within the org's rate limit
+# instead of triggering 429 backoff storms
+OPENAI_CONCURRENCY = int(os.getenv('OPENAI_CONCURRENCY', '50'))
+_request_semaphore = threading.BoundedSemaphore(OPENAI_CONCURRENCY)
+
+# asyncio.Semaphore binds to the loop it was created under, so the async
+# path keeps one semaphore per running loop instead of a module global
+_async_semaphores: Dict[int, asyncio.Semaphore] = {}
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Get the concurrency semaphore for the running event loop."""
+    key = id(asyncio.get_running_loop())
+    sem = _async_semaphores.get(key)
+    if sem is None:
+        sem = _async_semaphores[key] = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    return sem
+
+# Fast path for the well-known {"api_key": "sk-..."} secret shape; avoids
+# a full JSON parse on the cold-start path
+_API_KEY_RE = re.compile(r'"api_key"\s*:\s*"([^"]+)"')
+
+# Memoized LLM responses keyed by a digest of the normalized inputs:
+# duplicate deliveries and retries of the same email would otherwise pay
+# a full HTTP round trip for output we already hold. Low temperature
+# makes the responses deterministic enough to reuse for a week
+_response_cache = TTLCache(maxsize=512, ttl=7 * 86400)
+
+
+def _freeze(obj: Any) -> Any:
+    """Recursively convert dicts and lists into hashable tuples.
+
+    generate_response takes nested dicts; freezing them yields a stable
+    cache key without serializing the whole structure to a string.
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, list):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+
+def _content_key(kind: str, model: str, *parts: Optional[str]) -> str:
+    """Digest call inputs into a compact cache key.
+
+    Args:
+        kind: Operation name, so extraction and estimation keys can't collide
+        model: Model the call would use
+        *parts: Prompt inputs; None is treated as empty
+
+    Returns:
+        Hex digest usable as a dict key
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (kind, model, *parts):
+        h.update((part or '').strip().lower().encode())
+        h.update(b'\x00')  # Keep adjacent parts from running together
+    return h.hexdigest()
+
+# One alternation scan replaces a Python loop of substring checks over
+# a lowered copy of the text (basic sanitization; in production,
+# consider more sophisticated detection)
+_INJECTION_RE = re.compile(
+    r'ignore previous instructions'
+    r'|disregard all prior'
+    r'|forget everything'
+    r'|new instructions:'
+    r'|system:',
+    re.IGNORECASE
+)
+
+# Short inputs (subjects, sender lines) recur across an email thread;
+# memoizing the scan turns repeats into a dict hit
+_INJECTION_CACHE_MAX_LEN = 256
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_injection(text: str) -> Optional[str]:
+    """Return the first injection pattern found in text, if any."""
+    match = _INJECTION_RE.search(text)
+    return match.group(0).lower() if match else None
+
+
+def _get_shared_client(api_key: str) -> OpenAI:
+    """Get or lazily build the shared OpenAI client.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared OpenAI client instance
+    """
+    global _client_cache
+    with _client_lock:
+        # Rebuild if the key changed or the OpenAI class was replaced
+        # (the latter happens when tests patch the client class)
+        if (_client_cache is None or _client_cache[0] is not OpenAI
+                or _client_cache[1] != api_key):
+            _client_cache = (OpenAI, api_key, OpenAI(api_key=api_key))
+        return _client_cache[2]
+
+
+def _get_shared_async_client(api_key: str) -> AsyncOpenAI:
+    """Get or lazily build the shared AsyncOpenAI client.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared AsyncOpenAI client instance
+    """
+    global _async_client_cache
+    with _client_lock:
+        if (_async_client_cache is None or _async_client_cache[0] is not AsyncOpenAI
+                or _async_client_cache[1] != api_key):
+            _async_client_cache = (AsyncOpenAI, api_key, AsyncOpenAI(api_key=api_key))
+        return _async_client_cache[2]
+
 
 # OpenAI Pricing (as of 2025-10-14, per 1M tokens)
 MODEL_PRICING = {
@@ -36,7 +169,7 @@ class AIClient:
             organization_id: Organization ID for usage tracking
         """
         self.api_key = self._get_api_key()
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _get_shared_client(self.api_key)
         self.extraction_model = Config.OPENAI_MODEL_EXTRACTION
         self.estimation_model = Config.OPENAI_MODEL_ESTIMATION
         self.organization_id = organization_id
@@ -48,7 +181,6 @@ class AIClient:
             OpenAI API key
         """
         # First check environment variable (for local development and tests)
-        import os
         if os.environ.get('OPENAI_API_KEY'):
             return os.environ.get('OPENAI_API_KEY')
         
@@ -60,8 +192,12 @@ class AIClient:
         try:
             secrets_client = boto3.client('secretsmanager', **Config.get_boto3_config())
             response = secrets_client.get_secret_value(SecretId=Config.OPENAI_API_KEY_SECRET)
-            secret_data = json.loads(response['SecretString'])
-            return secret_data['api_key']
+            secret_string = response['SecretString']
+            match = _API_KEY_RE.search(secret_string)
+            if match:
+                return match.group(1)
+            # Fall back to a full parse for secrets with extra fields
+            return _json_loads(secret_string)['api_key']
         except Exception as e:
             # In test environments, return a dummy key
             # Tests should mock the OpenAI client anyway
@@ -69,18 +205,23 @@ class AIClient:
             logger.warning("Using dummy API key for testing")
             return "sk-test-dummy-key-for-testing"
     
-    def extract_project_data(self, sender: str, subject: str, body: str, 
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Shared AsyncOpenAI client, built lazily on first async call."""
+        return _get_shared_async_client(self.api_key)
+
+    def _extraction_request(self, sender: str, subject: str, body: str,
                             attachments_summary: Optional[str] = None) -> Dict[str, Any]:
-        """Extract project information from email using AI.
-        
+        """Build the chat-completion kwargs for project data extraction.
+
         Args:
             sender: Email sender address
             subject: Email subject
             body: Email body text
             attachments_summary: Summary of attachments (optional)
-            
+
         Returns:
-            Extracted project data as structured JSON
+            Keyword arguments for chat.completions.create
         """
         system_prompt = """You are an expert construction project manager assistant.
 
@@ -121,40 +262,105 @@ Body:
 
         if attachments_summary:
             user_prompt += f"\n\nAttachments: {attachments_summary}"
-        
+
+        return dict(
+            model=self.extraction_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,  # Low temperature for consistency
+            response_format={"type": "json_object"}
+        )
+
+    def _finish_extraction(self, response) -> Dict[str, Any]:
+        """Track usage for an extraction response and parse its JSON."""
+        usage = response.usage
+        cost = self._calculate_cost(
+            self.extraction_model,
+            usage.prompt_tokens,
+            usage.completion_tokens
+        )
+        self._track_usage(
+            self.extraction_model,
+            usage.prompt_tokens,
+            usage.completion_tokens,
+            cost
+        )
+
+        content = response.choices[0].message.content
+        logger.info("Successfully extracted project data")
+        return _json_loads(content)
+
+    def extract_project_data(self, sender: str, subject: str, body: str,
+                            attachments_summary: Optional[str] = None) -> Dict[str, Any]:
+        """Extract project information from email using AI.
+
+        Args:
+            sender: Email sender address
+            subject: Email subject
+            body: Email body text
+            attachments_summary: Summary of attachments (optional)
+
+        Returns:
+            Extracted project data as structured JSON
+        """
+        cache_key = _content_key('extract', self.extraction_model,
+                                 sender, subject, body, attachments_summary)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Extraction cache hit")
+            return cached
+
+        request = self._extraction_request(sender, subject, body, attachments_summary)
         try:
             logger.info("Calling OpenAI for project data extraction")
-            response = self.client.chat.completions.create(
-                model=self.extraction_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Low temperature for consistency
-                response_format={"type": "json_object"}
-            )
-            
-            # Track usage and cost
-            usage = response.usage
-            cost = self._calculate_cost(
-                self.extraction_model,
-                usage.prompt_tokens,
-                usage.completion_tokens
-            )
-            self._track_usage(
-                self.extraction_model,
-                usage.prompt_tokens,
-                usage.completion_tokens,
-                cost
-            )
-            
-            content = response.choices[0].message.content
-            logger.info("Successfully extracted project data")
-            return json.loads(content)
+            with _request_semaphore:
+                response = self.client.chat.completions.create(**request)
+            result = self._finish_extraction(response)
+            _response_cache.set(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"Failed to extract project data: {str(e)}")
             raise
-    
+
+    async def extract_project_data_async(self, sender: str, subject: str, body: str,
+                                         attachments_summary: Optional[str] = None) -> Dict[str, Any]:
+        """Extract project information from email using AI, concurrently.
+
+        Same prompt and parsing as extract_project_data, but awaitable:
+        callers processing a batch of emails can overlap the network
+        round trips with asyncio.gather instead of paying them serially.
+
+        Args:
+            sender: Email sender address
+            subject: Email subject
+            body: Email body text
+            attachments_summary: Summary of attachments (optional)
+
+        Returns:
+            Extracted project data as structured JSON
+        """
+        cache_key = _content_key('extract', self.extraction_model,
+                                 sender, subject, body, attachments_summary)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Extraction cache hit")
+            return cached
+
+        request = self._extraction_request(sender, subject, body, attachments_summary)
+        try:
+            logger.info("Calling OpenAI for project data extraction")
+            async with _get_async_semaphore():
+                response = await self.aclient.chat.completions.create(**request)
+            result = self._finish_extraction(response)
+            _response_cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to extract project data: {str(e)}")
+            raise
+
+
     def generate_estimate(self, documents_text: str, project_type: str, 
                          trade: Optional[str] = None) -> Dict[str, Any]:
         """Generate construction estimate from documents using AI.
@@ -205,19 +411,27 @@ Documents:
 {documents_text}
 
 Provide detailed line items with quantities and unit costs."""
-        
+
+        cache_key = _content_key('estimate', self.estimation_model,
+                                 documents_text, project_type, trade)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Estimate cache hit")
+            return cached
+
         try:
             logger.info(f"Generating estimate for {project_type} project")
-            response = self.client.chat.completions.create(
-                model=self.estimation_model,  # Use more capable model for estimates
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
-            
+            with _request_semaphore:
+                response = self.client.chat.completions.create(
+                    model=self.estimation_model,  # Use more capable model for estimates
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.2,
+                    response_format={"type": "json_object"}
+                )
+
             # Track usage and cost
             usage = response.usage
             cost = self._calculate_cost(
@@ -231,10 +445,12 @@ Provide detailed line items with quantities and unit costs."""
                 usage.completion_tokens,
                 cost
             )
-            
+
             content = response.choices[0].message.content
             logger.info("Successfully generated estimate")
-            return json.loads(content)
+            result = _json_loads(content)
+            _response_cache.set(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"Failed to generate estimate: {str(e)}")
             raise
@@ -271,18 +487,26 @@ Extracted Information:
 {json.dumps(extracted_data, indent=2)}
 
 Generate an appropriate response."""
-        
+
+        cache_key = ('response', self.extraction_model, request_type,
+                     _freeze(email_context), _freeze(extracted_data))
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Response cache hit")
+            return cached
+
         try:
             logger.info(f"Generating {request_type} response")
-            response = self.client.chat.completions.create(
-                model=self.extraction_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7  # Higher temperature for more natural responses
-            )
-            
+            with _request_semaphore:
+                response = self.client.chat.completions.create(
+                    model=self.extraction_model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.7  # Higher temperature for more natural responses
+                )
+
             # Track usage and cost
             usage = response.usage
             cost = self._calculate_cost(
@@ -296,8 +520,10 @@ Generate an appropriate response."""
                 usage.completion_tokens,
                 cost
             )
-            
-            return response.choices[0].message.content
+
+            result = response.choices[0].message.content
+            _response_cache.set(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"Failed to generate response: {str(e)}")
             raise
@@ -317,22 +543,17 @@ Generate an appropriate response."""
             logger.warning(f"Input truncated from {len(text)} to {max_length} chars")
             text = text[:max_length]
         
-        # Remove potential injection attempts (basic sanitization)
-        # In production, consider more sophisticated sanitization
-        dangerous_patterns = [
-            "ignore previous instructions",
-            "disregard all prior",
-            "forget everything",
-            "new instructions:",
-            "system:",
-        ]
-        
-        lower_text = text.lower()
-        for pattern in dangerous_patterns:
-            if pattern in lower_text:
-                logger.warning(f"Potential injection attempt detected: {pattern}")
-                # Don't remove, but log for monitoring
-        
+        # Memoize detection for short recurring inputs; long bodies are
+        # unlikely to repeat and would bloat the cache
+        if len(text) < _INJECTION_CACHE_MAX_LEN:
+            pattern = _find_injection(text)
+        else:
+            match = _INJECTION_RE.search(text)
+            pattern = match.group(0).lower() if match else None
+        if pattern:
+            # Don't remove, but log for monitoring
+            logger.warning("Potential injection attempt detected: %s", pattern)
+
         return text
     
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
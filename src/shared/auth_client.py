@@ -139,9 +139,9 @@ class AuthClient:
             # Generate temporary password if not provided
             if not temporary_password:
                 import secrets
-                import string
-                alphabet = string.ascii_letters + string.digits
-                temporary_password = ''.join(secrets.choice(alphabet) for _ in range(12)) + 'Aa1!'
+                # Single urandom read; suffix guarantees Cognito's
+                # upper/lower/digit/symbol policy is satisfied
+                temporary_password = secrets.token_urlsafe(12)[:12] + 'Aa1!'
             
             # Create user with email as username
             response = self.cognito_client.admin_create_user(
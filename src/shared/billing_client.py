@@ -1,14 +1,205 @@
 """Billing client for Stripe integration."""
-import stripe
 import boto3
-import json
-from typing import Dict, Optional, Any, List
+import functools
+import os
+import random
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
+from .caching import TTLCache as _TTLCache
 from .config import Config
+from .fastjson import loads as _json_loads
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# The Stripe SDK is a multi-MB import that only billing flows need, so
+# it is imported and configured on first use; handlers that pull in this
+# module transitively but never bill skip the cold-start cost entirely
+stripe = None
+_stripe_import_lock = threading.Lock()
+
+
+def _load_stripe() -> Any:
+    """Import and configure the Stripe SDK on first use.
+
+    Returns:
+        The configured stripe module
+    """
+    global stripe
+    if stripe is None:
+        with _stripe_import_lock:
+            if stripe is None:
+                import stripe as stripe_module
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Route all Stripe calls through one keepalive connection
+                # pool so warm invocations and parallel flows skip repeated
+                # TLS handshakes; transient HTTP errors retry at the
+                # transport layer
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=20,
+                    pool_maxsize=20,
+                    max_retries=Retry(total=3, backoff_factor=0.2,
+                                      status_forcelist=[429, 500, 502, 503, 504])
+                ))
+                stripe_module.default_http_client = stripe_module.http_client.RequestsClient(
+                    session=session
+                )
+
+                # Pin the API version so responses never depend on
+                # account-level rollout
+                stripe_module.api_version = '2023-10-16'
+
+                stripe = stripe_module
+    return stripe
+
+# Stripe API key cached at module scope so repeated BillingClient
+# constructions in a warm process skip the Secrets Manager round trip
+_api_key_lock = threading.Lock()
+_cached_api_key: Optional[str] = None
+
+# Secrets Manager client shared across calls; boto3 client construction
+# parses service models and is too expensive to repeat per fetch
+_secrets_client_lock = threading.Lock()
+_secrets_client: Optional[Any] = None
+
+
+def _get_secrets_client() -> Any:
+    """Get or lazily build the shared Secrets Manager client.
+
+    Returns:
+        boto3 Secrets Manager client
+    """
+    global _secrets_client
+    if _secrets_client is None:
+        with _secrets_client_lock:
+            if _secrets_client is None:
+                _secrets_client = boto3.client('secretsmanager', **Config.get_boto3_config())
+    return _secrets_client
+
+
+class _RateLimiter:
+    """Token-bucket limiter pacing Stripe calls at a steady rate."""
+
+    def __init__(self, rate_per_second: float):
+        self._rate = rate_per_second
+        self._capacity = rate_per_second
+        self._tokens = rate_per_second
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+# Stripe allows ~100 read ops/s live and 25/s in test mode; default to
+# the conservative test-mode limit so backfills never trigger 429 storms
+_rate_limiter = _RateLimiter(float(os.getenv('STRIPE_RATE_LIMIT_RPS', '25')))
+
+
+def _call_stripe(func: Any, *args: Any, **kwargs: Any) -> Any:
+    """Invoke a Stripe SDK callable under the token bucket.
+
+    Retries rate-limited calls with exponential backoff and jitter so
+    bulk flows degrade to a steady pace instead of thrashing.
+
+    Args:
+        func: Stripe SDK callable
+        *args: Positional arguments for the call
+        **kwargs: Keyword arguments for the call
+
+    Returns:
+        Stripe response object
+    """
+    _load_stripe()
+    for attempt in range(6):
+        _rate_limiter.acquire()
+        try:
+            return func(*args, **kwargs)
+        except stripe.error.RateLimitError:
+            if attempt == 5:
+                raise
+            delay = (2 ** attempt) * 0.1 + random.random() * 0.1
+            logger.warning(f"Stripe rate limit hit, retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+
+# Short-TTL caches for read-heavy Stripe lookups (billing dashboards hit
+# the same customer/subscription many times per session); write paths
+# invalidate the affected subscription entry
+_customer_cache = _TTLCache(ttl=300.0)
+_subscription_cache = _TTLCache(ttl=300.0)
+_invoice_cache = _TTLCache(ttl=300.0)
+
+# Recently processed webhook event ids; Stripe redelivers events on
+# retry, and replaying one means duplicate downstream DB writes
+_seen_webhook_events = _TTLCache(maxsize=10_000, ttl=3600.0)
+
+# Webhook events older than this are treated as replays and flagged
+WEBHOOK_MAX_AGE_SECONDS = 3600
+
+# Dedicated executor for fanning out independent Stripe calls; kept
+# separate from the default executor so bulk billing flows can't starve
+# other thread users
+_stripe_executor = ThreadPoolExecutor(max_workers=10)
+
+# Secret strings fetched in one batch call so the Stripe and OpenAI keys
+# don't each pay their own Secrets Manager round trip on cold start
+_secret_strings: Dict[str, str] = {}
+
+
+def _bootstrap_secrets() -> None:
+    """Fetch all known application secrets with a single batch call."""
+    secret_ids = ['stripe-api-key', Config.OPENAI_API_KEY_SECRET]
+    try:
+        response = _get_secrets_client().batch_get_secret_value(SecretIdList=secret_ids)
+        for secret in response.get('SecretValues', []):
+            _secret_strings[secret['Name']] = secret['SecretString']
+    except Exception as e:
+        # batch_get_secret_value is not available in every region/API
+        # version; callers fall back to per-secret get_secret_value
+        logger.warning(f"Batch secret retrieval unavailable: {str(e)}")
+
+
+# Feature tuples composed by concatenation so each tier shares its
+# predecessor's prefix instead of duplicating strings; tuples are
+# immutable, so get_tier_config can hand them out without copy-on-return
+_STARTER_FEATURES: Tuple[str, ...] = (
+    'Email processing',
+    'AI extraction',
+    'Basic timeline',
+    'Email support'
+)
+_PROFESSIONAL_FEATURES: Tuple[str, ...] = _STARTER_FEATURES + (
+    'Unlimited projects',
+    'Advanced analytics',
+    'Priority support',
+    'Custom integrations'
+)
+_ENTERPRISE_FEATURES: Tuple[str, ...] = _PROFESSIONAL_FEATURES + (
+    'Dedicated support',
+    'Custom AI models',
+    'SLA guarantee',
+    'On-premise deployment option'
+)
 
 # Subscription tier configurations
 SUBSCRIPTION_TIERS = {
@@ -19,12 +210,7 @@ SUBSCRIPTION_TIERS = {
         'project_limit': 2,
         'api_budget': 20.00,
         'user_limit': 1,
-        'features': [
-            'Email processing',
-            'AI extraction',
-            'Basic timeline',
-            'Email support'
-        ]
+        'features': _STARTER_FEATURES
     },
     'professional': {
         'name': 'Professional',
@@ -33,13 +219,7 @@ SUBSCRIPTION_TIERS = {
         'project_limit': None,  # Unlimited
         'api_budget': 100.00,
         'user_limit': 5,
-        'features': [
-            'Everything in Starter',
-            'Unlimited projects',
-            'Advanced analytics',
-            'Priority support',
-            'Custom integrations'
-        ]
+        'features': _PROFESSIONAL_FEATURES
     },
     'enterprise': {
         'name': 'Enterprise',
@@ -48,41 +228,86 @@ SUBSCRIPTION_TIERS = {
         'project_limit': None,  # Unlimited
         'api_budget': None,  # Custom
         'user_limit': None,  # Unlimited
-        'features': [
-            'Everything in Professional',
-            'Dedicated support',
-            'Custom AI models',
-            'SLA guarantee',
-            'On-premise deployment option'
-        ]
+        'features': _ENTERPRISE_FEATURES
     }
 }
 
+# Read-only view so hot paths can rely on the table never mutating
+SUBSCRIPTION_TIERS = types.MappingProxyType(SUBSCRIPTION_TIERS)
+
+# Flat limit table precomputed at import so per-request limit checks do
+# a single lookup and tuple unpack instead of a chain of dict .get()s
+_TIER_LIMITS = {
+    name: (tier['email_limit'], tier['project_limit'],
+           tier['api_budget'], tier['user_limit'])
+    for name, tier in SUBSCRIPTION_TIERS.items()
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _normalize_tier(tier_name: str) -> str:
+    """Map a tier name to its canonical lowercase key.
+
+    Args:
+        tier_name: Tier name in any casing
+
+    Returns:
+        Canonical tier key, defaulting to 'starter' for unknown tiers
+    """
+    name = tier_name.lower()
+    return name if name in SUBSCRIPTION_TIERS else 'starter'
+
 
 class BillingClient:
     """Wrapper for Stripe billing operations."""
     
     def __init__(self):
         """Initialize Stripe client."""
+        _load_stripe()
         self.api_key = self._get_stripe_api_key()
-        stripe.api_key = self.api_key
-    
+        if stripe.api_key != self.api_key:
+            stripe.api_key = self.api_key
+
+        # Pre-bound SDK references for hot call sites; skips the
+        # module/class attribute chain on every call
+        self._customer_retrieve = stripe.Customer.retrieve
+        self._sub_retrieve = stripe.Subscription.retrieve
+        self._sub_modify = stripe.Subscription.modify
+        self._invoice_list = stripe.Invoice.list
+        self._usage_create = stripe.SubscriptionItem.create_usage_record
+
     def _get_stripe_api_key(self) -> str:
-        """Get Stripe API key from Secrets Manager.
-        
+        """Get Stripe API key, fetching it at most once per process.
+
+        Returns:
+            Stripe API key
+        """
+        global _cached_api_key
+        with _api_key_lock:
+            if _cached_api_key is None:
+                _cached_api_key = self._fetch_stripe_api_key()
+            return _cached_api_key
+
+    def _fetch_stripe_api_key(self) -> str:
+        """Fetch Stripe API key from the environment or Secrets Manager.
+
         Returns:
             Stripe API key
         """
-        import os
         # Check environment variable first (for local dev)
-        if os.environ.get('STRIPE_API_KEY'):
-            return os.environ.get('STRIPE_API_KEY')
-        
+        env_key = os.environ.get('STRIPE_API_KEY')
+        if env_key:
+            return env_key
+
         # Get from AWS Secrets Manager for production
         try:
-            secrets_client = boto3.client('secretsmanager', **Config.get_boto3_config())
-            response = secrets_client.get_secret_value(SecretId='stripe-api-key')
-            secret_data = json.loads(response['SecretString'])
+            if 'stripe-api-key' not in _secret_strings:
+                _bootstrap_secrets()
+            secret_string = _secret_strings.get('stripe-api-key')
+            if secret_string is None:
+                response = _get_secrets_client().get_secret_value(SecretId='stripe-api-key')
+                secret_string = response['SecretString']
+            secret_data = _json_loads(secret_string)
             return secret_data['api_key']
         except Exception as e:
             logger.error(f"Failed to retrieve Stripe API key: {str(e)}")
@@ -109,7 +334,8 @@ class BillingClient:
                 **(metadata or {})
             }
             
-            customer = stripe.Customer.create(
+            customer = _call_stripe(
+                stripe.Customer.create,
                 email=email,
                 name=organization_name,
                 metadata=customer_metadata
@@ -134,7 +360,8 @@ class BillingClient:
             Stripe subscription object
         """
         try:
-            subscription = stripe.Subscription.create(
+            subscription = _call_stripe(
+                stripe.Subscription.create,
                 customer=customer_id,
                 items=[{'price': price_id}],
                 trial_period_days=trial_days,
@@ -148,7 +375,26 @@ class BillingClient:
             logger.error(f"Failed to create subscription: {str(e)}")
             raise
     
-    def cancel_subscription(self, subscription_id: str, 
+    def create_subscriptions_bulk(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create multiple subscriptions in parallel.
+
+        Each Stripe call is a full network round trip, so independent
+        creates (e.g. during bulk org provisioning) are fanned out across
+        a shared thread pool instead of paying N x RTT serially.
+
+        Args:
+            items: List of keyword-argument dicts for create_subscription
+
+        Returns:
+            List of subscription objects in the same order as items
+        """
+        futures = [
+            _stripe_executor.submit(self.create_subscription, **item)
+            for item in items
+        ]
+        return [future.result() for future in futures]
+
+    def cancel_subscription(self, subscription_id: str,
                            cancel_at_period_end: bool = True) -> Dict[str, Any]:
         """Cancel a subscription.
         
@@ -161,43 +407,53 @@ class BillingClient:
         """
         try:
             if cancel_at_period_end:
-                subscription = stripe.Subscription.modify(
+                subscription = _call_stripe(
+                    stripe.Subscription.modify,
                     subscription_id,
                     cancel_at_period_end=True
                 )
             else:
-                subscription = stripe.Subscription.delete(subscription_id)
-            
+                subscription = _call_stripe(stripe.Subscription.delete, subscription_id)
+
+            _subscription_cache.pop(subscription_id)
             logger.info(f"Canceled subscription: {subscription_id}")
             return subscription
         except stripe.error.StripeError as e:
             logger.error(f"Failed to cancel subscription: {str(e)}")
             raise
     
-    def update_subscription(self, subscription_id: str, new_price_id: str) -> Dict[str, Any]:
+    def update_subscription(self, subscription_id: str, new_price_id: str,
+                           subscription_item_id: Optional[str] = None) -> Dict[str, Any]:
         """Update subscription to a different price/tier.
-        
+
         Args:
             subscription_id: Stripe subscription ID
             new_price_id: New Stripe price ID
-            
+            subscription_item_id: Subscription item ID; callers that
+                persisted it at creation time (it is in the
+                create_subscription response) skip one Stripe round trip
+
         Returns:
             Updated subscription object
         """
         try:
-            # Get current subscription
-            subscription = stripe.Subscription.retrieve(subscription_id)
-            
+            if subscription_item_id is None:
+                # Slow path: retrieve the subscription to find the item id
+                current = _call_stripe(self._sub_retrieve, subscription_id)
+                subscription_item_id = current['items']['data'][0].id
+
             # Update subscription item with new price
-            stripe.Subscription.modify(
+            subscription = _call_stripe(
+                self._sub_modify,
                 subscription_id,
                 items=[{
-                    'id': subscription['items']['data'][0].id,
+                    'id': subscription_item_id,
                     'price': new_price_id,
                 }],
                 proration_behavior='create_prorations'
             )
-            
+
+            _subscription_cache.pop(subscription_id)
             logger.info(f"Updated subscription {subscription_id} to new price: {new_price_id}")
             return subscription
         except stripe.error.StripeError as e:
@@ -218,7 +474,8 @@ class BillingClient:
             Checkout session object
         """
         try:
-            session = stripe.checkout.Session.create(
+            session = _call_stripe(
+                stripe.checkout.Session.create,
                 customer=customer_id,
                 payment_method_types=['card'],
                 line_items=[{
@@ -251,7 +508,8 @@ class BillingClient:
             Billing portal session object
         """
         try:
-            session = stripe.billing_portal.Session.create(
+            session = _call_stripe(
+                stripe.billing_portal.Session.create,
                 customer=customer_id,
                 return_url=return_url
             )
@@ -275,10 +533,13 @@ class BillingClient:
             Usage record object
         """
         try:
-            usage_record = stripe.SubscriptionItem.create_usage_record(
+            usage_record = _call_stripe(
+                self._usage_create,
                 subscription_item_id,
                 quantity=quantity,
-                timestamp=timestamp or int(datetime.now().timestamp()),
+                # time.time() skips the datetime + tz conversion; the None
+                # sentinel keeps an explicit timestamp of 0 usable
+                timestamp=timestamp if timestamp is not None else int(time.time()),
                 action='set'  # 'set' replaces value, 'increment' adds to it
             )
             
@@ -288,6 +549,26 @@ class BillingClient:
             logger.error(f"Failed to record usage: {str(e)}")
             raise
     
+    def record_usage_bulk(self, records: List[Tuple[str, int, Optional[int]]]) -> List[Dict[str, Any]]:
+        """Record multiple usage records in parallel.
+
+        The pinned Stripe SDK has no true batch endpoint for usage
+        records, so independent records are fanned out across the shared
+        thread pool instead of paying one round trip each.
+
+        Args:
+            records: List of (subscription_item_id, quantity, timestamp)
+                tuples; timestamp may be None for "now"
+
+        Returns:
+            List of usage record objects in the same order as records
+        """
+        futures = [
+            _stripe_executor.submit(self.record_usage, item_id, quantity, timestamp)
+            for item_id, quantity, timestamp in records
+        ]
+        return [future.result() for future in futures]
+
     def get_customer(self, customer_id: str) -> Dict[str, Any]:
         """Retrieve a Stripe customer.
         
@@ -297,8 +578,12 @@ class BillingClient:
         Returns:
             Customer object
         """
+        cached = _customer_cache.get(customer_id)
+        if cached is not None:
+            return cached
         try:
-            customer = stripe.Customer.retrieve(customer_id)
+            customer = _call_stripe(self._customer_retrieve, customer_id)
+            _customer_cache.set(customer_id, customer)
             return customer
         except stripe.error.StripeError as e:
             logger.error(f"Failed to retrieve customer: {str(e)}")
@@ -313,8 +598,12 @@ class BillingClient:
         Returns:
             Subscription object
         """
+        cached = _subscription_cache.get(subscription_id)
+        if cached is not None:
+            return cached
         try:
-            subscription = stripe.Subscription.retrieve(subscription_id)
+            subscription = _call_stripe(self._sub_retrieve, subscription_id)
+            _subscription_cache.set(subscription_id, subscription)
             return subscription
         except stripe.error.StripeError as e:
             logger.error(f"Failed to retrieve subscription: {str(e)}")
@@ -330,28 +619,37 @@ class BillingClient:
         Returns:
             List of invoice objects
         """
+        cached = _invoice_cache.get((customer_id, limit))
+        if cached is not None:
+            return cached
         try:
-            invoices = stripe.Invoice.list(
+            invoices = _call_stripe(
+                self._invoice_list,
                 customer=customer_id,
                 limit=limit
             )
+            _invoice_cache.set((customer_id, limit), invoices.data)
             return invoices.data
         except stripe.error.StripeError as e:
             logger.error(f"Failed to list invoices: {str(e)}")
             raise
     
-    def verify_webhook_signature(self, payload: bytes, signature: str, 
-                                 webhook_secret: str) -> Dict[str, Any]:
+    def verify_webhook_signature(self, payload: bytes, signature: str,
+                                 webhook_secret: str) -> Tuple[Dict[str, Any], bool]:
         """Verify Stripe webhook signature and parse event.
-        
+
+        Stripe redelivers events on retry, so the event id is checked
+        against a one-hour seen-set; duplicates and stale replays are
+        flagged so callers can skip downstream processing.
+
         Args:
             payload: Raw request body bytes
             signature: Stripe-Signature header value
             webhook_secret: Webhook endpoint secret
-            
+
         Returns:
-            Parsed event object
-            
+            Tuple of (parsed event object, is_duplicate)
+
         Raises:
             stripe.error.SignatureVerificationError: If signature is invalid
         """
@@ -359,7 +657,17 @@ class BillingClient:
             event = stripe.Webhook.construct_event(
                 payload, signature, webhook_secret
             )
-            return event
+
+            event_id = event['id']
+            if _seen_webhook_events.get(event_id) is not None:
+                logger.info(f"Duplicate webhook event: {event_id}")
+                return event, True
+            if event.get('created', 0) < time.time() - WEBHOOK_MAX_AGE_SECONDS:
+                logger.warning(f"Stale webhook event: {event_id}")
+                return event, True
+
+            _seen_webhook_events.set(event_id, True)
+            return event, False
         except ValueError as e:
             logger.error(f"Invalid payload: {str(e)}")
             raise
@@ -377,10 +685,35 @@ class BillingClient:
         Returns:
             Tier configuration
         """
-        return SUBSCRIPTION_TIERS.get(tier_name.lower(), SUBSCRIPTION_TIERS['starter'])
+        return SUBSCRIPTION_TIERS[_normalize_tier(tier_name)]
     
     @staticmethod
-    def check_usage_limits(tier_name: str, email_count: int, project_count: int, 
+    def is_within_limits(tier_name: str, email_count: int, project_count: int,
+                         api_spend: float) -> bool:
+        """Check whether usage is within tier limits (boolean fast path).
+
+        Request-time quota gates only need a yes/no answer; this skips
+        the report dict that check_usage_limits builds and short-circuits
+        on the first exceeded limit.
+
+        Args:
+            tier_name: Tier name
+            email_count: Number of emails processed
+            project_count: Number of projects
+            api_spend: API spending in USD
+
+        Returns:
+            True if all limits are within bounds
+        """
+        email_limit, project_limit, api_budget, _ = _TIER_LIMITS[_normalize_tier(tier_name)]
+        return not (
+            (email_limit is not None and email_count > email_limit)
+            or (project_limit is not None and project_count > project_limit)
+            or (api_budget is not None and api_spend > api_budget)
+        )
+
+    @staticmethod
+    def check_usage_limits(tier_name: str, email_count: int, project_count: int,
                           api_spend: float) -> Dict[str, bool]:
         """Check if usage is within tier limits.
         
@@ -393,17 +726,17 @@ class BillingClient:
         Returns:
             Dictionary with limit check results
         """
-        tier = SUBSCRIPTION_TIERS.get(tier_name.lower(), SUBSCRIPTION_TIERS['starter'])
-        
+        email_limit, project_limit, api_budget, _ = _TIER_LIMITS[_normalize_tier(tier_name)]
+
         return {
-            'email_limit_exceeded': tier['email_limit'] is not None and email_count > tier['email_limit'],
-            'project_limit_exceeded': tier['project_limit'] is not None and project_count > tier['project_limit'],
-            'api_budget_exceeded': tier['api_budget'] is not None and api_spend > tier['api_budget'],
+            'email_limit_exceeded': email_limit is not None and email_count > email_limit,
+            'project_limit_exceeded': project_limit is not None and project_count > project_limit,
+            'api_budget_exceeded': api_budget is not None and api_spend > api_budget,
             'email_count': email_count,
-            'email_limit': tier['email_limit'],
+            'email_limit': email_limit,
             'project_count': project_count,
-            'project_limit': tier['project_limit'],
+            'project_limit': project_limit,
             'api_spend': api_spend,
-            'api_budget': tier['api_budget']
+            'api_budget': api_budget
         }
 
@@ -0,0 +1,51 @@
+"""Small in-process caches shared by the client wrappers.
+
+Lambda containers stay warm between invocations, so a bounded TTL cache
+in front of read-heavy lookups turns repeat network round trips into
+dict lookups without any external cache infrastructure.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TTLCache:
+    """Small thread-safe dict cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._data: Dict[Any, Any] = {}  # key -> (expires_at, value)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting expired entries when full."""
+        with self._lock:
+            if len(self._data) >= self._maxsize:
+                now = time.monotonic()
+                self._data = {k: v for k, v in self._data.items() if v[0] >= now}
+                if len(self._data) >= self._maxsize:
+                    self._data.clear()
+            self._data[key] = (time.monotonic() + self._ttl, value)
+
+    def pop(self, key: Any) -> None:
+        """Drop a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
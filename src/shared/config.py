@@ -3,15 +3,55 @@ import os
 from typing import Optional
 
 
+def _env_bool(name: str, default: str = 'false') -> bool:
+    """Parse a boolean environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Fallback value if unset
+
+    Returns:
+        Parsed boolean
+    """
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+def _env_int(name: str, default: int) -> int:
+    """Parse an integer environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Fallback value if unset or malformed
+
+    Returns:
+        Parsed integer
+    """
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
 class Config:
-    """Application configuration loaded from environment variables."""
-    
+    """Application configuration loaded from environment variables.
+
+    Used purely as a namespace; values are read once at import. Do not
+    instantiate or mutate at runtime (tests may monkeypatch attributes).
+    """
+
+    # Pure namespace: no per-instance state, nothing to instantiate
+    __slots__ = ()
+
+
     # Environment
     ENVIRONMENT: str = os.getenv('ENVIRONMENT', 'dev')
     AWS_REGION: str = os.getenv('AWS_REGION', 'us-east-1')
     
     # LocalStack
-    USE_LOCALSTACK: bool = os.getenv('USE_LOCALSTACK', 'false').lower() == 'true'
+    USE_LOCALSTACK: bool = _env_bool('USE_LOCALSTACK')
     AWS_ENDPOINT_URL: Optional[str] = os.getenv('AWS_ENDPOINT_URL')
     
     # Domain
@@ -44,21 +84,32 @@ class Config:
     OPENAI_MODEL_ESTIMATION: str = os.getenv('OPENAI_MODEL_ESTIMATION', 'gpt-4o')
     
     # Processing
-    MAX_ATTACHMENT_SIZE_MB: int = int(os.getenv('MAX_ATTACHMENT_SIZE_MB', '25'))
-    EMAIL_RETENTION_DAYS: int = int(os.getenv('EMAIL_RETENTION_DAYS', '90'))
+    MAX_ATTACHMENT_SIZE_MB: int = _env_int('MAX_ATTACHMENT_SIZE_MB', 25)
+    EMAIL_RETENTION_DAYS: int = _env_int('EMAIL_RETENTION_DAYS', 90)
     
     # Security
-    ENABLE_EMAIL_ALLOWLIST: bool = os.getenv('ENABLE_EMAIL_ALLOWLIST', 'false').lower() == 'true'
-    ALLOWED_SENDER_DOMAINS: str = os.getenv('ALLOWED_SENDER_DOMAINS', '')
+    ENABLE_EMAIL_ALLOWLIST: bool = _env_bool('ENABLE_EMAIL_ALLOWLIST')
+    # Raw comma-separated value kept for logging/debugging; callers use
+    # the precomputed frozenset so no per-email splitting is needed
+    ALLOWED_SENDER_DOMAINS_RAW: str = os.getenv('ALLOWED_SENDER_DOMAINS', '')
+    ALLOWED_SENDER_DOMAINS: frozenset = frozenset(
+        d.strip().lower() for d in ALLOWED_SENDER_DOMAINS_RAW.split(',') if d.strip()
+    )
     
     # Logging
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
-    
+
+    # Memoized boto3 config; built on first use so every AWS client
+    # construction doesn't re-read attributes and allocate a new dict
+    _BOTO3_CONFIG: Optional[dict] = None
+
     @classmethod
     def get_boto3_config(cls) -> dict:
-        """Get boto3 client configuration."""
-        config = {'region_name': cls.AWS_REGION}
-        if cls.USE_LOCALSTACK and cls.AWS_ENDPOINT_URL:
-            config['endpoint_url'] = cls.AWS_ENDPOINT_URL
-        return config
+        """Get boto3 client configuration (computed once per process)."""
+        if cls._BOTO3_CONFIG is None:
+            config = {'region_name': cls.AWS_REGION}
+            if cls.USE_LOCALSTACK and cls.AWS_ENDPOINT_URL:
+                config['endpoint_url'] = cls.AWS_ENDPOINT_URL
+            cls._BOTO3_CONFIG = config
+        return cls._BOTO3_CONFIG
 
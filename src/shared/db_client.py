@@ -1,22 +1,208 @@
 """DynamoDB client wrapper for multi-tenant project tracking operations."""
+import atexit
 import boto3
-from boto3.dynamodb.conditions import Key
+import functools
+import heapq
+import queue
+import threading
+import time
+import zlib
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config as BotocoreConfig
+from botocore.exceptions import ClientError
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+import secrets
 import uuid
 from decimal import Decimal
+from .caching import TTLCache
 from .config import Config
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Transport tuning shared by every table handle: TCP keep-alive and a
+# wide connection pool avoid re-paying the TLS handshake on warm
+# invocations, short timeouts with adaptive retries keep tail latency
+# bounded instead of hanging on a sick connection
+_BOTO_CONFIG = BotocoreConfig(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=1,
+    read_timeout=3
+)
+
+# Retention horizon for raw usage records, precomputed once
+_NINETY_DAYS_S = 90 * 86400
+
+# (epoch day, formatted date); the string only changes at midnight, so
+# per-write strftime is skipped until the day rolls over
+_date_cache: tuple = ((0, 0), '')
+
+
+def _next_id() -> str:
+    """Time-sortable id: nanosecond timestamp hex plus a random tail.
+
+    Ids generated this way sort lexicographically by creation time, so
+    range keys derived from them keep write locality, and the 4-byte
+    random suffix costs one os.urandom read instead of uuid4's 16 bytes
+    per id.
+    """
+    return time.time_ns().to_bytes(8, 'big').hex() + secrets.token_hex(4)
+
+
+def _now_ms() -> int:
+    """Current epoch time in milliseconds.
+
+    time.time_ns avoids constructing a datetime per write; every create
+    and update stamps items through this helper.
+    """
+    return time.time_ns() // 1_000_000
+
+
+def _today(now: Optional[float] = None) -> str:
+    """A date as YYYY-MM-DD, cached until the local day changes.
+
+    Args:
+        now: Epoch seconds to format; defaults to the current time.
+            Callers that already read the clock pass it through so all
+            fields derived from one moment agree across midnight.
+    """
+    global _date_cache
+    lt = time.localtime(now)
+    day = (lt.tm_year, lt.tm_yday)
+    if _date_cache[0] != day:
+        _date_cache = (day, time.strftime('%Y-%m-%d', lt))
+    return _date_cache[1]
+
+
+# (organization_id, project_id) -> composite sort key. The sort key
+# embeds the creation timestamp and never changes for the life of a
+# project, so entries cannot go stale; the bound just caps memory in
+# warm containers
+_SORT_KEY_CACHE_MAX = 4096
+_sort_key_cache: Dict[tuple, str] = {}
+
+
+def _remember_sort_key(organization_id: str, project_id: str, sort_key: str) -> None:
+    """Cache a project's composite sort key for later update_item calls."""
+    if len(_sort_key_cache) >= _SORT_KEY_CACHE_MAX:
+        _sort_key_cache.clear()
+    _sort_key_cache[(organization_id, project_id)] = sort_key
+
+
+# Short-TTL caches for hot tenant-resolution reads; organizations and
+# users change rarely but are looked up on every authenticated request.
+# Misses are never cached, and the update_* methods invalidate entries
+_org_cache = TTLCache(maxsize=4096, ttl=60.0)
+_user_cache = TTLCache(maxsize=4096, ttl=60.0)
+
+
+def _invalidate_org_cache(organization_id: str, *sources: Optional[Dict[str, Any]]) -> None:
+    """Drop all cache entries that can point at an organization.
+
+    Args:
+        organization_id: Organization ID
+        *sources: Dicts (cached item, updates) that may carry the
+            organization's email_address/subdomain index keys
+    """
+    _org_cache.pop(('id', organization_id))
+    for source in sources:
+        if not source:
+            continue
+        if source.get('email_address'):
+            _org_cache.pop(('email', source['email_address']))
+        if source.get('subdomain'):
+            _org_cache.pop(('subdomain', source['subdomain']))
+
+
+def _projection_kwargs(attributes: Optional[List[str]]) -> Dict[str, Any]:
+    """Build ProjectionExpression kwargs for an attribute whitelist.
+
+    Numbered placeholders sidestep DynamoDB reserved-word collisions
+    ('status', 'timestamp', 'ttl' are all reserved).
+
+    Args:
+        attributes: Attribute names to project, or None for full items
+
+    Returns:
+        Query kwargs to merge in (empty when attributes is None)
+    """
+    if not attributes:
+        return {}
+    names = {f'#a{i}': attr for i, attr in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+
+# Summary whitelist for event lists; detail views fetch the full item
+_EVENT_SUMMARY_ATTRIBUTES = ['event_id', 'event_timestamp', 'event_type']
+
+
+def _org_proj_key(organization_id: str, project_id: str) -> str:
+    """Build the composite events partition key (org#project)."""
+    return f"{organization_id}#{project_id}"
+
+
+# Write shards for high-volume projects: all events for one project
+# otherwise share a single partition, capping throughput at the
+# per-partition WCU limit. Salting the key spreads writes; reads fan
+# out across the shards and merge. Gated per project so small tenants
+# don't pay the read amplification
+EVENT_SHARDS = 10
+
+
+def _org_date_key(organization_id: str, date: str) -> str:
+    """Build the composite usage partition key (org#date)."""
+    return f"{organization_id}#{date}"
+
+
+@functools.lru_cache(maxsize=128)
+def _build_update_template(fields: tuple) -> tuple:
+    """Build the expression parts for an update with the given fields.
+
+    Update shapes repeat heavily (the same handful of field sets per
+    handler), so the string/dict construction is memoized per sorted
+    field tuple; only the values dict is built per call.
+
+    Args:
+        fields: Sorted tuple of field names being updated
+
+    Returns:
+        Tuple of (UpdateExpression, ExpressionAttributeNames)
+    """
+    update_expr = 'SET ' + ', '.join(f'#{k} = :{k}' for k in fields)
+    expr_attr_names = {f'#{k}': k for k in fields}
+    return update_expr, expr_attr_names
+
+
+# Executor for fanning out independent per-partition queries; the daily
+# composite keys partition cleanly, so the round trips can overlap
+# instead of running serially
+_query_executor = ThreadPoolExecutor(max_workers=8)
+
 
 class DynamoDBClient:
     """Wrapper for DynamoDB operations with multi-tenant support."""
     
     def __init__(self):
         """Initialize DynamoDB client."""
-        self.dynamodb = boto3.resource('dynamodb', **Config.get_boto3_config())
+        self.dynamodb = boto3.resource('dynamodb', config=_BOTO_CONFIG,
+                                       **Config.get_boto3_config())
+        # Standalone low-level client for hot single-item reads; the
+        # resource's own client re-applies document transforms, so raw
+        # attribute maps must go through a plain client. One reused
+        # serializer/deserializer pair saves per-call Python work
+        self.client = boto3.client('dynamodb', config=_BOTO_CONFIG,
+                                   **Config.get_boto3_config())
+        self._ser = TypeSerializer()
+        self._des = TypeDeserializer()
         self.organizations_table = self.dynamodb.Table(Config.ORGANIZATIONS_TABLE)
         self.projects_table = self.dynamodb.Table(Config.PROJECTS_TABLE)
         self.events_table = self.dynamodb.Table(Config.EVENTS_TABLE)
@@ -35,7 +221,7 @@ class DynamoDBClient:
             Organization ID
         """
         organization_id = f"ORG-{uuid.uuid4().hex[:12]}"
-        timestamp = int(datetime.now().timestamp() * 1000)
+        timestamp = _now_ms()
         
         item = {
             'organization_id': organization_id,
@@ -56,6 +242,82 @@ class DynamoDBClient:
             logger.error(f"Failed to create organization: {str(e)}")
             raise
     
+    def create_organization_with_owner(self, org_data: Dict[str, Any],
+                                       owner_data: Dict[str, Any]) -> str:
+        """Create an organization, its owner, and a signup event atomically.
+
+        Signup used to be three serial writes with no atomicity; a single
+        TransactWriteItems is one round trip and either all three items
+        land or none do, so a failure can't leave a half-created tenant.
+
+        Args:
+            org_data: Organization information (organization_name, email_address, subdomain, etc.)
+            owner_data: Owner user information (must include 'user_email')
+
+        Returns:
+            Organization ID
+        """
+        if 'user_email' not in owner_data:
+            raise ValueError("user_email is required")
+
+        organization_id = f"ORG-{uuid.uuid4().hex[:12]}"
+        timestamp = _now_ms()
+
+        org_item = {
+            'organization_id': organization_id,
+            'created_at': timestamp,
+            'updated_at': timestamp,
+            'subscription_tier': 'starter',
+            'billing_status': 'active',
+            'monthly_api_budget': Decimal('20'),
+            'current_month_spend': Decimal('0'),
+            **org_data
+        }
+        user_item = {
+            'created_at': timestamp,
+            'role': 'owner',
+            **owner_data,
+            'organization_id': organization_id
+        }
+        # Organization-level events use the reserved 'ORG' project slot
+        event_item = {
+            'organization_id': organization_id,
+            'project_id': 'ORG',
+            'organization_id_project_id': _org_proj_key(organization_id, 'ORG'),
+            'event_timestamp': timestamp,
+            'event_id': str(uuid.uuid4()),
+            'event_type': 'ORGANIZATION_CREATED',
+            'owner_email': owner_data['user_email']
+        }
+
+        serialize = self._ser.serialize
+
+        def to_attr_map(item: Dict[str, Any]) -> Dict[str, Any]:
+            return {k: serialize(v) for k, v in item.items()}
+
+        try:
+            logger.info(f"Creating organization with owner: {organization_id}")
+            self.client.transact_write_items(TransactItems=[
+                {'Put': {
+                    'TableName': Config.ORGANIZATIONS_TABLE,
+                    'Item': to_attr_map(org_item),
+                    'ConditionExpression': 'attribute_not_exists(organization_id)'
+                }},
+                {'Put': {
+                    'TableName': Config.USERS_TABLE,
+                    'Item': to_attr_map(user_item),
+                    'ConditionExpression': 'attribute_not_exists(user_email)'
+                }},
+                {'Put': {
+                    'TableName': Config.EVENTS_TABLE,
+                    'Item': to_attr_map(event_item)
+                }}
+            ])
+            return organization_id
+        except Exception as e:
+            logger.error(f"Failed to create organization with owner: {str(e)}")
+            raise
+
     def get_organization(self, organization_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve organization by ID.
         
@@ -65,9 +327,19 @@ class DynamoDBClient:
         Returns:
             Organization data or None if not found
         """
+        cached = _org_cache.get(('id', organization_id))
+        if cached is not None:
+            return cached
         try:
-            response = self.organizations_table.get_item(Key={'organization_id': organization_id})
-            return response.get('Item')
+            response = self.client.get_item(
+                TableName=Config.ORGANIZATIONS_TABLE,
+                Key={'organization_id': self._ser.serialize(organization_id)}
+            )
+            raw = response.get('Item')
+            item = {k: self._des.deserialize(v) for k, v in raw.items()} if raw else None
+            if item:
+                _org_cache.set(('id', organization_id), item)
+            return item
         except Exception as e:
             logger.error(f"Failed to get organization {organization_id}: {str(e)}")
             raise
@@ -81,6 +353,9 @@ class DynamoDBClient:
         Returns:
             Organization data or None if not found
         """
+        cached = _org_cache.get(('email', email_address))
+        if cached is not None:
+            return cached
         try:
             response = self.organizations_table.query(
                 IndexName='email_address-index',
@@ -88,7 +363,10 @@ class DynamoDBClient:
                 Limit=1
             )
             items = response.get('Items', [])
-            return items[0] if items else None
+            if items:
+                _org_cache.set(('email', email_address), items[0])
+                return items[0]
+            return None
         except Exception as e:
             logger.error(f"Failed to get organization by email {email_address}: {str(e)}")
             raise
@@ -102,6 +380,9 @@ class DynamoDBClient:
         Returns:
             Organization data or None if not found
         """
+        cached = _org_cache.get(('subdomain', subdomain))
+        if cached is not None:
+            return cached
         try:
             response = self.organizations_table.query(
                 IndexName='subdomain-index',
@@ -109,7 +390,10 @@ class DynamoDBClient:
                 Limit=1
             )
             items = response.get('Items', [])
-            return items[0] if items else None
+            if items:
+                _org_cache.set(('subdomain', subdomain), items[0])
+                return items[0]
+            return None
         except Exception as e:
             logger.error(f"Failed to get organization by subdomain {subdomain}: {str(e)}")
             raise
@@ -122,20 +406,20 @@ class DynamoDBClient:
             updates: Fields to update
         """
         try:
-            updates['updated_at'] = int(datetime.now().timestamp() * 1000)
+            updates['updated_at'] = _now_ms()
             
-            # Build update expression
-            update_expr = 'SET ' + ', '.join([f'#{k} = :{k}' for k in updates.keys()])
-            expr_attr_names = {f'#{k}': k for k in updates.keys()}
+            update_expr, expr_attr_names = _build_update_template(tuple(sorted(updates)))
             expr_attr_values = {f':{k}': v for k, v in updates.items()}
             
             logger.info(f"Updating organization: {organization_id}")
+            cached = _org_cache.get(('id', organization_id))
             self.organizations_table.update_item(
                 Key={'organization_id': organization_id},
                 UpdateExpression=update_expr,
                 ExpressionAttributeNames=expr_attr_names,
                 ExpressionAttributeValues=expr_attr_values
             )
+            _invalidate_org_cache(organization_id, cached, updates)
         except Exception as e:
             logger.error(f"Failed to update organization {organization_id}: {str(e)}")
             raise
@@ -152,30 +436,56 @@ class DynamoDBClient:
         Returns:
             Project ID
         """
-        project_id = f"PROJ-{uuid.uuid4().hex[:8]}"
-        timestamp = int(datetime.now().timestamp() * 1000)
-        
-        # Composite sort key: project_id#timestamp
-        project_id_created_at = f"{project_id}#{timestamp}"
-        
-        item = {
-            'organization_id': organization_id,
-            'project_id': project_id,
-            'project_id_created_at': project_id_created_at,
-            'created_at': timestamp,
-            'updated_at': timestamp,
-            'status': 'active',
-            **project_data
-        }
-        
+        return self.create_projects_bulk(organization_id, [project_data])[0]
+
+    def create_projects_bulk(self, organization_id: str,
+                             projects: List[Dict[str, Any]]) -> List[str]:
+        """Create multiple projects with batched writes.
+
+        Projects go out via BatchWriteItem (25 items per round trip)
+        instead of one put_item each; migrations and bulk imports pay
+        one HTTPS round trip per 25 projects rather than per project.
+
+        Args:
+            organization_id: Organization ID
+            projects: List of project information dicts
+
+        Returns:
+            List of project IDs in the same order as projects
+        """
+        project_ids = []
+        items = []
+        for project_data in projects:
+            project_id = f"PROJ-{_next_id()}"
+            timestamp = _now_ms()
+
+            # Composite sort key: project_id#timestamp
+            project_id_created_at = f"{project_id}#{timestamp}"
+
+            items.append({
+                'organization_id': organization_id,
+                'project_id': project_id,
+                'project_id_created_at': project_id_created_at,
+                'created_at': timestamp,
+                'updated_at': timestamp,
+                'status': 'active',
+                **project_data
+            })
+            project_ids.append(project_id)
+
         try:
-            logger.info(f"Creating project: {project_id} for org: {organization_id}")
-            self.projects_table.put_item(Item=item)
-            return project_id
+            logger.info(f"Creating {len(items)} project(s) for org: {organization_id}")
+            with self.projects_table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            for item in items:
+                _remember_sort_key(organization_id, item['project_id'],
+                                   item['project_id_created_at'])
+            return project_ids
         except Exception as e:
-            logger.error(f"Failed to create project: {str(e)}")
+            logger.error(f"Failed to create projects: {str(e)}")
             raise
-    
+
     def get_project(self, organization_id: str, project_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve project by ID within an organization.
         
@@ -194,18 +504,25 @@ class DynamoDBClient:
                 Limit=1
             )
             items = response.get('Items', [])
-            return items[0] if items else None
+            if items:
+                _remember_sort_key(organization_id, project_id,
+                                   items[0]['project_id_created_at'])
+                return items[0]
+            return None
         except Exception as e:
             logger.error(f"Failed to get project {project_id}: {str(e)}")
             raise
     
-    def get_projects_by_organization(self, organization_id: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_projects_by_organization(self, organization_id: str, status: Optional[str] = None,
+                                     attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get all projects for an organization.
-        
+
         Args:
             organization_id: Organization ID
             status: Optional status filter ('active', 'completed', 'on-hold')
-            
+            attributes: Optional attribute whitelist; trims response
+                payloads for summary views
+
         Returns:
             List of projects
         """
@@ -214,37 +531,83 @@ class DynamoDBClient:
                 # Use the organization_id-status-index
                 response = self.projects_table.query(
                     IndexName='organization_id-status-index',
-                    KeyConditionExpression=Key('organization_id').eq(organization_id) & Key('status').eq(status)
+                    KeyConditionExpression=Key('organization_id').eq(organization_id) & Key('status').eq(status),
+                    **_projection_kwargs(attributes)
                 )
             else:
                 # Query all projects for organization
                 response = self.projects_table.query(
-                    KeyConditionExpression=Key('organization_id').eq(organization_id)
+                    KeyConditionExpression=Key('organization_id').eq(organization_id),
+                    **_projection_kwargs(attributes)
                 )
             return response.get('Items', [])
         except Exception as e:
             logger.error(f"Failed to get projects for organization {organization_id}: {str(e)}")
             raise
     
-    def get_projects_by_client(self, client_email: str) -> List[Dict[str, Any]]:
+    def get_projects_by_client(self, client_email: str,
+                               attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get all projects for a client email address (cross-organization for migration).
-        
+
         Args:
             client_email: Client email address
-            
+            attributes: Optional attribute whitelist; trims response
+                payloads for summary views
+
         Returns:
             List of projects
         """
         try:
             response = self.projects_table.query(
                 IndexName='client_email-index',
-                KeyConditionExpression=Key('client_email').eq(client_email)
+                KeyConditionExpression=Key('client_email').eq(client_email),
+                **_projection_kwargs(attributes)
             )
             return response.get('Items', [])
         except Exception as e:
             logger.error(f"Failed to get projects for client {client_email}: {str(e)}")
             raise
+
+    def count_projects_by_client(self, client_email: str) -> int:
+        """Count a client's projects without fetching the items.
+
+        Select='COUNT' makes DynamoDB return only the tally, so callers
+        that never read the items skip the item payload entirely.
+
+        Args:
+            client_email: Client email address
+
+        Returns:
+            Number of projects for the client
+        """
+        try:
+            response = self.projects_table.query(
+                IndexName='client_email-index',
+                KeyConditionExpression=Key('client_email').eq(client_email),
+                Select='COUNT'
+            )
+            return response.get('Count', 0)
+        except Exception as e:
+            logger.error(f"Failed to count projects for client {client_email}: {str(e)}")
+            raise
     
+    def get_projects_by_clients(self, client_emails: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get projects for many client emails with concurrent queries.
+
+        Migration flows walk long client lists; the per-client queries
+        are independent, so they fan out across the shared executor
+        (botocore releases the GIL around I/O) instead of paying one
+        round trip after another.
+
+        Args:
+            client_emails: Client email addresses (duplicates collapsed)
+
+        Returns:
+            Mapping of client email to that client's projects
+        """
+        emails = list(dict.fromkeys(client_emails))
+        return dict(zip(emails, _query_executor.map(self.get_projects_by_client, emails)))
+
     def update_project(self, organization_id: str, project_id: str, updates: Dict[str, Any]) -> None:
         """Update project information.
         
@@ -254,98 +617,247 @@ class DynamoDBClient:
             updates: Fields to update
         """
         try:
-            # Get the project first to find the exact sort key
-            project = self.get_project(organization_id, project_id)
-            if not project:
-                raise ValueError(f"Project {project_id} not found in organization {organization_id}")
-            
-            updates['updated_at'] = int(datetime.now().timestamp() * 1000)
+            # Resolve the exact sort key from cache; the sort key is
+            # immutable once created, so a hit skips one Query round trip
+            sort_key = _sort_key_cache.get((organization_id, project_id))
+            if sort_key is None:
+                project = self.get_project(organization_id, project_id)
+                if not project:
+                    raise ValueError(f"Project {project_id} not found in organization {organization_id}")
+                sort_key = project['project_id_created_at']
+
+            updates['updated_at'] = _now_ms()
             
-            # Build update expression
-            update_expr = 'SET ' + ', '.join([f'#{k} = :{k}' for k in updates.keys()])
-            expr_attr_names = {f'#{k}': k for k in updates.keys()}
+            update_expr, expr_attr_names = _build_update_template(tuple(sorted(updates)))
             expr_attr_values = {f':{k}': v for k, v in updates.items()}
             
             logger.info(f"Updating project: {project_id}")
-            self.projects_table.update_item(
-                Key={
-                    'organization_id': organization_id,
-                    'project_id_created_at': project['project_id_created_at']
-                },
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values
-            )
+            try:
+                self.projects_table.update_item(
+                    Key={
+                        'organization_id': organization_id,
+                        'project_id_created_at': sort_key
+                    },
+                    UpdateExpression=update_expr,
+                    ExpressionAttributeNames=expr_attr_names,
+                    ExpressionAttributeValues=expr_attr_values,
+                    # Existence is checked server-side in the same round
+                    # trip, covering the cache-hit path that skips the
+                    # pre-read; a stale cached sort key fails the
+                    # condition instead of upserting a ghost item
+                    ConditionExpression=Attr('organization_id').exists()
+                )
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                    _sort_key_cache.pop((organization_id, project_id), None)
+                    raise ValueError(f"Project {project_id} not found in organization {organization_id}")
+                raise
         except Exception as e:
             logger.error(f"Failed to update project {project_id}: {str(e)}")
             raise
     
     # ==================== Event Methods ====================
     
-    def create_event(self, organization_id: str, project_id: str, event_data: Dict[str, Any]) -> str:
+    def create_event(self, organization_id: str, project_id: str, event_data: Dict[str, Any],
+                     high_volume: bool = False) -> str:
         """Create a project event (append-only audit log).
-        
+
         Args:
             organization_id: Organization ID
             project_id: Project ID
             event_data: Event information
-            
+            high_volume: Salt the partition key across EVENT_SHARDS for
+                projects whose write rate can hot-spot one partition
+
         Returns:
             Event ID
         """
-        event_id = str(uuid.uuid4())
-        timestamp = int(datetime.now().timestamp() * 1000)
-        
-        # Composite partition key: organization_id#project_id
-        organization_id_project_id = f"{organization_id}#{project_id}"
-        
-        item = {
-            'organization_id': organization_id,
-            'project_id': project_id,
-            'organization_id_project_id': organization_id_project_id,
-            'event_timestamp': timestamp,
-            'event_id': event_id,
-            **event_data
-        }
-        
+        return self.create_events_bulk(organization_id, project_id, [event_data],
+                                       high_volume=high_volume)[0]
+
+    def create_events_bulk(self, organization_id: str, project_id: str,
+                           events: List[Dict[str, Any]],
+                           high_volume: bool = False) -> List[str]:
+        """Create multiple project events with batched writes.
+
+        Events go out via BatchWriteItem (25 items per round trip) instead
+        of one put_item each, so ingestion bursts pay one HTTPS round trip
+        per 25 events rather than per event.
+
+        Args:
+            organization_id: Organization ID
+            project_id: Project ID
+            events: List of event information dicts
+            high_volume: Salt the partition key across EVENT_SHARDS for
+                projects whose write rate can hot-spot one partition
+
+        Returns:
+            List of event IDs in the same order as events
+        """
+        organization_id_project_id = _org_proj_key(organization_id, project_id)
+
+        event_ids = []
+        items = []
+        last_timestamp = 0
+        for event_data in events:
+            event_id = str(uuid.uuid4())
+            # event_timestamp is the sort key; bump by 1ms within a burst
+            # so same-millisecond events can't overwrite each other
+            timestamp = max(_now_ms(), last_timestamp + 1)
+            last_timestamp = timestamp
+            if high_volume:
+                # Deterministic salt: same-millisecond bursts still land
+                # on different shards as the timestamp advances
+                partition_key = f"{organization_id_project_id}#{timestamp % EVENT_SHARDS}"
+            else:
+                partition_key = organization_id_project_id
+            items.append({
+                'organization_id': organization_id,
+                'project_id': project_id,
+                'organization_id_project_id': partition_key,
+                'event_timestamp': timestamp,
+                'event_id': event_id,
+                **event_data
+            })
+            event_ids.append(event_id)
+
         try:
-            logger.info(f"Creating event for project {project_id}: {event_id}")
-            self.events_table.put_item(Item=item)
-            return event_id
+            logger.info(f"Creating {len(items)} event(s) for project {project_id}")
+            # batch_writer chunks into 25-item BatchWriteItem calls and
+            # retries UnprocessedItems; throttling gets exponential backoff
+            for attempt in range(5):
+                try:
+                    with self.events_table.batch_writer() as batch:
+                        for item in items:
+                            batch.put_item(Item=item)
+                    break
+                except ClientError as e:
+                    code = e.response.get('Error', {}).get('Code')
+                    if code != 'ProvisionedThroughputExceededException' or attempt == 4:
+                        raise
+                    time.sleep((2 ** attempt) * 0.1)
+            return event_ids
         except Exception as e:
-            logger.error(f"Failed to create event: {str(e)}")
+            logger.error(f"Failed to create events: {str(e)}")
             raise
     
-    def get_project_events(self, organization_id: str, project_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_project_events(self, organization_id: str, project_id: str, limit: int = 100,
+                           attributes: Optional[List[str]] = None,
+                           high_volume: bool = False) -> List[Dict[str, Any]]:
         """Get events for a project in chronological order.
-        
+
         Args:
             organization_id: Organization ID
             project_id: Project ID
             limit: Maximum number of events to return
-            
+            attributes: Optional attribute whitelist; trims response
+                payloads for summary views
+            high_volume: Read across the salted shards written by
+                create_event with high_volume=True
+
         Returns:
             List of events
         """
         try:
-            organization_id_project_id = f"{organization_id}#{project_id}"
-            response = self.events_table.query(
-                KeyConditionExpression=Key('organization_id_project_id').eq(organization_id_project_id),
-                ScanIndexForward=False,  # Descending order (newest first)
-                Limit=limit
-            )
-            return response.get('Items', [])
+            organization_id_project_id = _org_proj_key(organization_id, project_id)
+
+            def query_partition(partition_key: str) -> List[Dict[str, Any]]:
+                # Limit caps items per page, not per query; wide events
+                # can hit the 1 MB page boundary short of the limit, so
+                # follow LastEvaluatedKey until the limit is filled
+                items: List[Dict[str, Any]] = []
+                kwargs = dict(
+                    KeyConditionExpression=Key('organization_id_project_id').eq(partition_key),
+                    ScanIndexForward=False,  # Descending order (newest first)
+                    **_projection_kwargs(attributes)
+                )
+                while len(items) < limit:
+                    response = self.events_table.query(
+                        Limit=limit - len(items), **kwargs)
+                    items.extend(response.get('Items', []))
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        break
+                    kwargs['ExclusiveStartKey'] = last_key
+                return items
+
+            if not high_volume:
+                return query_partition(organization_id_project_id)
+
+            # Fan out one query per shard and merge the already-sorted
+            # partial results by timestamp: O(N log SHARDS)
+            futures = [
+                _query_executor.submit(query_partition, f"{organization_id_project_id}#{shard}")
+                for shard in range(EVENT_SHARDS)
+            ]
+            merged = heapq.merge(*(f.result() for f in futures),
+                                 key=lambda item: item['event_timestamp'],
+                                 reverse=True)
+            return [item for item, _ in zip(merged, range(limit))]
         except Exception as e:
             logger.error(f"Failed to get events for project {project_id}: {str(e)}")
             raise
-    
-    def get_organization_events(self, organization_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+
+    def list_event_summaries(self, organization_id: str, project_id: str,
+                             limit: int = 100,
+                             high_volume: bool = False) -> List[Dict[str, Any]]:
+        """Get lightweight event summaries for timeline views.
+
+        Args:
+            organization_id: Organization ID
+            project_id: Project ID
+            limit: Maximum number of events to return
+            high_volume: Read across the salted shards written by
+                create_events_bulk with high_volume=True
+
+        Returns:
+            List of events projected to id, timestamp and type
+        """
+        return self.get_project_events(organization_id, project_id, limit=limit,
+                                       attributes=_EVENT_SUMMARY_ATTRIBUTES,
+                                       high_volume=high_volume)
+
+    def get_event_details(self, organization_id: str, project_id: str,
+                          event_timestamp: int,
+                          high_volume: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the full item for a single event.
+
+        Args:
+            organization_id: Organization ID
+            project_id: Project ID
+            event_timestamp: Event timestamp (sort key from a summary row)
+            high_volume: Event was written with the salted partition
+                scheme; the shard is derived from the timestamp, so the
+                lookup stays a single GetItem
+
+        Returns:
+            Event data or None if not found
+        """
+        try:
+            partition_key = _org_proj_key(organization_id, project_id)
+            if high_volume:
+                # The write path salts with timestamp % EVENT_SHARDS, so
+                # the sort key alone pins the event's shard
+                partition_key = f"{partition_key}#{event_timestamp % EVENT_SHARDS}"
+            response = self.events_table.get_item(Key={
+                'organization_id_project_id': partition_key,
+                'event_timestamp': event_timestamp
+            })
+            return response.get('Item')
+        except Exception as e:
+            logger.error(f"Failed to get event at {event_timestamp} for project {project_id}: {str(e)}")
+            raise
+
+    def get_organization_events(self, organization_id: str, limit: int = 100,
+                                attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get all events for an organization.
-        
+
         Args:
             organization_id: Organization ID
             limit: Maximum number of events to return
-            
+            attributes: Optional attribute whitelist; trims response
+                payloads for summary views
+
         Returns:
             List of events
         """
@@ -354,7 +866,8 @@ class DynamoDBClient:
                 IndexName='organization_id-index',
                 KeyConditionExpression=Key('organization_id').eq(organization_id),
                 ScanIndexForward=False,  # Descending order (newest first)
-                Limit=limit
+                Limit=limit,
+                **_projection_kwargs(attributes)
             )
             return response.get('Items', [])
         except Exception as e:
@@ -365,26 +878,44 @@ class DynamoDBClient:
     
     def create_user(self, user_data: Dict[str, Any]) -> None:
         """Create or update user account.
-        
+
         Args:
             user_data: User information (must include 'user_email' and 'organization_id')
         """
-        if 'user_email' not in user_data:
-            raise ValueError("user_email is required")
-        if 'organization_id' not in user_data:
-            raise ValueError("organization_id is required")
-        
-        item = {
-            'created_at': int(datetime.now().timestamp() * 1000),
-            'role': 'viewer',  # Default role
-            **user_data
-        }
-        
+        self.create_users_bulk([user_data])
+
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> None:
+        """Create or update multiple user accounts with batched writes.
+
+        Accounts go out via BatchWriteItem (25 items per round trip)
+        instead of one put_item each; tenant onboarding imports pay one
+        HTTPS round trip per 25 users rather than per user.
+
+        Args:
+            users: List of user information dicts (each must include
+                'user_email' and 'organization_id')
+        """
+        items = []
+        for user_data in users:
+            if 'user_email' not in user_data:
+                raise ValueError("user_email is required")
+            if 'organization_id' not in user_data:
+                raise ValueError("organization_id is required")
+            items.append({
+                'created_at': _now_ms(),
+                'role': 'viewer',  # Default role
+                **user_data
+            })
+
         try:
-            logger.info(f"Creating/updating user: {user_data['user_email']}")
-            self.users_table.put_item(Item=item)
+            logger.info(f"Creating/updating {len(items)} user(s)")
+            with self.users_table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            for item in items:
+                _user_cache.pop(item['user_email'])
         except Exception as e:
-            logger.error(f"Failed to create user: {str(e)}")
+            logger.error(f"Failed to create users: {str(e)}")
             raise
     
     def get_user(self, user_email: str) -> Optional[Dict[str, Any]]:
@@ -396,32 +927,129 @@ class DynamoDBClient:
         Returns:
             User data or None if not found
         """
+        cached = _user_cache.get(user_email)
+        if cached is not None:
+            return cached
         try:
-            response = self.users_table.get_item(Key={'user_email': user_email})
-            return response.get('Item')
+            response = self.client.get_item(
+                TableName=Config.USERS_TABLE,
+                Key={'user_email': self._ser.serialize(user_email)}
+            )
+            raw = response.get('Item')
+            item = {k: self._des.deserialize(v) for k, v in raw.items()} if raw else None
+            if item:
+                _user_cache.set(user_email, item)
+            return item
         except Exception as e:
             logger.error(f"Failed to get user {user_email}: {str(e)}")
             raise
     
-    def get_organization_users(self, organization_id: str) -> List[Dict[str, Any]]:
+    def get_organization_users(self, organization_id: str,
+                               attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get all users in an organization.
-        
+
         Args:
             organization_id: Organization ID
-            
+            attributes: Optional attribute whitelist; trims response
+                payloads for summary views
+
         Returns:
             List of users
         """
         try:
             response = self.users_table.query(
                 IndexName='organization_id-index',
-                KeyConditionExpression=Key('organization_id').eq(organization_id)
+                KeyConditionExpression=Key('organization_id').eq(organization_id),
+                **_projection_kwargs(attributes)
             )
             return response.get('Items', [])
         except Exception as e:
             logger.error(f"Failed to get users for organization {organization_id}: {str(e)}")
             raise
     
+    def _batch_get(self, request_items: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run a BatchGetItem with one retry for unprocessed keys.
+
+        Args:
+            request_items: RequestItems mapping of table name to keys
+
+        Returns:
+            Mapping of table name to fetched items
+        """
+        response = self.dynamodb.batch_get_item(RequestItems=request_items)
+        responses = response.get('Responses', {})
+        unprocessed = response.get('UnprocessedKeys') or {}
+        if unprocessed:
+            retry = self.dynamodb.batch_get_item(RequestItems=unprocessed)
+            for table, items in retry.get('Responses', {}).items():
+                responses.setdefault(table, []).extend(items)
+        return responses
+
+    def get_tenant_context(self, organization_id: str,
+                           user_email: str) -> tuple:
+        """Fetch an organization and a user in one round trip.
+
+        Request handlers resolve both on every authenticated call; a
+        single cross-table BatchGetItem replaces two serial reads, and
+        warm TTL-cache entries skip the call entirely.
+
+        Args:
+            organization_id: Organization ID
+            user_email: User email address
+
+        Returns:
+            Tuple of (organization, user), each None if not found
+        """
+        org = _org_cache.get(('id', organization_id))
+        user = _user_cache.get(user_email)
+        if org is not None and user is not None:
+            return org, user
+
+        try:
+            responses = self._batch_get({
+                Config.ORGANIZATIONS_TABLE: {'Keys': [{'organization_id': organization_id}]},
+                Config.USERS_TABLE: {'Keys': [{'user_email': user_email}]}
+            })
+            orgs = responses.get(Config.ORGANIZATIONS_TABLE, [])
+            users = responses.get(Config.USERS_TABLE, [])
+            org = orgs[0] if orgs else None
+            user = users[0] if users else None
+            if org:
+                _org_cache.set(('id', organization_id), org)
+            if user:
+                _user_cache.set(user_email, user)
+            return org, user
+        except Exception as e:
+            logger.error(f"Failed to get tenant context for {organization_id}: {str(e)}")
+            raise
+
+    def get_users_bulk(self, user_emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch multiple users with batched reads.
+
+        Team-listing views need many users at once; BatchGetItem takes
+        up to 100 keys per call instead of one round trip per user.
+
+        Args:
+            user_emails: User email addresses (duplicates are collapsed)
+
+        Returns:
+            Mapping of user email to user data; missing users are absent
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        emails = list(dict.fromkeys(user_emails))
+        try:
+            for i in range(0, len(emails), 100):
+                chunk = emails[i:i + 100]
+                responses = self._batch_get({
+                    Config.USERS_TABLE: {'Keys': [{'user_email': e} for e in chunk]}
+                })
+                for item in responses.get(Config.USERS_TABLE, []):
+                    results[item['user_email']] = item
+            return results
+        except Exception as e:
+            logger.error(f"Failed to bulk-get {len(emails)} users: {str(e)}")
+            raise
+
     def update_user(self, user_email: str, updates: Dict[str, Any]) -> None:
         """Update user information.
         
@@ -430,20 +1058,27 @@ class DynamoDBClient:
             updates: Fields to update
         """
         try:
-            updates['updated_at'] = int(datetime.now().timestamp() * 1000)
+            updates['updated_at'] = _now_ms()
             
-            # Build update expression
-            update_expr = 'SET ' + ', '.join([f'#{k} = :{k}' for k in updates.keys()])
-            expr_attr_names = {f'#{k}': k for k in updates.keys()}
+            update_expr, expr_attr_names = _build_update_template(tuple(sorted(updates)))
             expr_attr_values = {f':{k}': v for k, v in updates.items()}
             
             logger.info(f"Updating user: {user_email}")
-            self.users_table.update_item(
-                Key={'user_email': user_email},
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values
-            )
+            try:
+                self.users_table.update_item(
+                    Key={'user_email': user_email},
+                    UpdateExpression=update_expr,
+                    ExpressionAttributeNames=expr_attr_names,
+                    ExpressionAttributeValues=expr_attr_values,
+                    # Without this, updating a missing user silently
+                    # upserts a partial item
+                    ConditionExpression=Attr('user_email').exists()
+                )
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                    raise ValueError(f"User {user_email} not found")
+                raise
+            _user_cache.pop(user_email)
         except Exception as e:
             logger.error(f"Failed to update user {user_email}: {str(e)}")
             raise
@@ -457,14 +1092,16 @@ class DynamoDBClient:
             organization_id: Organization ID
             usage_data: Usage information (api_provider, model, tokens_used, cost_usd)
         """
-        timestamp = int(datetime.now().timestamp() * 1000)
-        date = datetime.now().strftime('%Y-%m-%d')
-        
-        # Composite partition key: organization_id#date
-        organization_id_date = f"{organization_id}#{date}"
-        
+        # One clock read feeds all three derived fields, so timestamp,
+        # date, and ttl can never straddle a midnight boundary
+        now = time.time()
+        timestamp = int(now * 1000)
+        date = _today(now)
+
+        organization_id_date = _org_date_key(organization_id, date)
+
         # TTL: 90 days from now
-        ttl = int((datetime.now().timestamp() + (90 * 24 * 60 * 60)))
+        ttl = int(now) + _NINETY_DAYS_S
         
         item = {
             'organization_id': organization_id,
@@ -474,12 +1111,104 @@ class DynamoDBClient:
             'ttl': ttl,
             **usage_data
         }
-        
+
         try:
-            self.api_usage_table.put_item(Item=item)
+            # The raw record, the daily rollup, and the monthly spend
+            # counter are independent writes; fan them out and join so
+            # the LLM hot path pays one round trip of latency, not three
+            futures = [
+                _query_executor.submit(self.api_usage_table.put_item, Item=item),
+                _query_executor.submit(
+                    self._increment_usage_rollup, organization_id, date,
+                    str(usage_data.get('model', 'unknown')),
+                    Decimal(str(usage_data.get('cost_usd', 0))),
+                    int(usage_data.get('tokens_used', 0)), 1, ttl)
+            ]
+            cost = usage_data.get('cost_usd', 0)
+            if cost:
+                futures.append(_query_executor.submit(
+                    self._increment_month_spend, organization_id, cost))
+            for future in futures:
+                future.result()
         except Exception as e:
             logger.error(f"Failed to track API usage: {str(e)}")
             raise
+
+    def track_api_usage_buffered(self, organization_id: str, usage_data: Dict[str, Any]) -> None:
+        """Queue a usage record for background batched ingest.
+
+        Takes the tracking I/O off the request path entirely; records
+        land within ~200ms via the shared UsageBuffer. Callers that need
+        read-after-write visibility should use track_api_usage.
+
+        Args:
+            organization_id: Organization ID
+            usage_data: Usage information (api_provider, model, tokens_used, cost_usd)
+        """
+        get_usage_buffer().put(organization_id, usage_data)
+
+    def _increment_month_spend(self, organization_id: str, cost: Any) -> None:
+        """Atomically add to the organization's materialized monthly spend.
+
+        Keeping the counter on the organization item turns "what has this
+        tenant spent this month?" into an O(1) read instead of an
+        aggregation. The counter only stays meaningful if something
+        zeroes it at the month boundary; no such job exists in this repo
+        yet, so deployments must schedule one (e.g. EventBridge cron on
+        the 1st) before relying on current_month_spend.
+
+        Args:
+            organization_id: Organization ID
+            cost: Cost in USD for one API call
+        """
+        self.organizations_table.update_item(
+            Key={'organization_id': organization_id},
+            UpdateExpression='ADD current_month_spend :c',
+            ExpressionAttributeValues={':c': Decimal(str(cost))}
+        )
+        _org_cache.pop(('id', organization_id))
+
+    def _increment_usage_rollup(self, organization_id: str, date: str,
+                                model: str, cost: Decimal, tokens: int,
+                                calls: int, ttl: int) -> None:
+        """Atomically bump the daily per-model usage rollup item.
+
+        Rollup items live under a dedicated `{org}#ROLLUP#{date}` partition
+        (one item per model, sort key derived from the model name) and
+        deliberately omit the `organization_id` attribute so they never
+        surface in GSI queries over the raw records. ADD is an atomic
+        server-side counter, so concurrent writers need no read-modify-write;
+        amounts are explicit so batched writers can coalesce many records
+        into one increment.
+
+        Args:
+            organization_id: Organization ID
+            date: Date in YYYY-MM-DD format
+            model: Model name the usage is attributed to
+            cost: Cost in USD to add
+            tokens: Token count to add
+            calls: Call count to add
+            ttl: Expiry epoch shared with the raw records
+        """
+        self.api_usage_table.update_item(
+            Key={
+                'organization_id_date': f"{organization_id}#ROLLUP#{date}",
+                # Sort key is numeric in this table; a CRC of the model
+                # name gives each model a stable slot within the day
+                'timestamp': zlib.crc32(model.encode())
+            },
+            UpdateExpression='SET #m = :m, #d = :d, #ttl = :ttl '
+                             'ADD cost_usd :c, tokens_used :t, calls :n',
+            ExpressionAttributeNames={'#m': 'model', '#d': 'date', '#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':m': model,
+                ':d': date,
+                ':ttl': ttl,
+                ':c': cost,
+                ':t': tokens,
+                ':n': calls
+            }
+        )
     
     def get_api_usage_by_date(self, organization_id: str, date: str) -> List[Dict[str, Any]]:
         """Get API usage for a specific date.
@@ -492,11 +1221,20 @@ class DynamoDBClient:
             List of usage records
         """
         try:
-            organization_id_date = f"{organization_id}#{date}"
-            response = self.api_usage_table.query(
-                KeyConditionExpression=Key('organization_id_date').eq(organization_id_date)
-            )
-            return response.get('Items', [])
+            organization_id_date = _org_date_key(organization_id, date)
+            # Busy days can exceed the 1 MB query page; follow
+            # LastEvaluatedKey so callers always see the full day
+            items = []
+            kwargs = {
+                'KeyConditionExpression': Key('organization_id_date').eq(organization_id_date)
+            }
+            while True:
+                response = self.api_usage_table.query(**kwargs)
+                items.extend(response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    return items
+                kwargs['ExclusiveStartKey'] = last_key
         except Exception as e:
             logger.error(f"Failed to get API usage for date {date}: {str(e)}")
             raise
@@ -512,41 +1250,212 @@ class DynamoDBClient:
             Summary with total_cost, total_tokens, breakdown by model
         """
         try:
-            # Query using organization_id-index for last N days
-            from datetime import timedelta
+            # Read the pre-aggregated daily rollups written by
+            # track_api_usage: one Query per day returning one row per
+            # model, instead of pulling every raw record into memory.
+            # Each day is its own partition, so the queries are
+            # independent and fan out in parallel rather than waiting
+            # one round trip per day
             start_date = datetime.now() - timedelta(days=days)
-            start_timestamp = int(start_date.timestamp() * 1000)
-            
-            response = self.api_usage_table.query(
-                IndexName='organization_id-index',
-                KeyConditionExpression=Key('organization_id').eq(organization_id) & 
-                                     Key('timestamp').gte(start_timestamp)
-            )
-            
-            items = response.get('Items', [])
-            
-            # Calculate summary
-            total_cost = sum(float(item.get('cost_usd', 0)) for item in items)
-            total_tokens = sum(int(item.get('tokens_used', 0)) for item in items)
-            
-            # Breakdown by model
-            model_breakdown = {}
-            for item in items:
-                model = item.get('model', 'unknown')
-                if model not in model_breakdown:
-                    model_breakdown[model] = {'cost': 0.0, 'tokens': 0, 'calls': 0}
-                model_breakdown[model]['cost'] += float(item.get('cost_usd', 0))
-                model_breakdown[model]['tokens'] += int(item.get('tokens_used', 0))
-                model_breakdown[model]['calls'] += 1
-            
+
+            def query_day(date: str) -> List[Dict[str, Any]]:
+                response = self.api_usage_table.query(
+                    KeyConditionExpression=Key('organization_id_date').eq(
+                        f"{organization_id}#ROLLUP#{date}"
+                    )
+                )
+                items = response.get('Items', [])
+                if items:
+                    return items
+                # Days written before the rollup path existed have raw
+                # records but no rollup partition; aggregate those
+                # directly so pre-cutover usage doesn't vanish from the
+                # summary. Genuinely idle days pay one extra empty query
+                return self.get_api_usage_by_date(organization_id, date)
+
+            dates = [(start_date + timedelta(days=offset)).strftime('%Y-%m-%d')
+                     for offset in range(days + 1)]
+            futures = [_query_executor.submit(query_day, date) for date in dates]
+
+            # Single pass with defaultdict accumulators: no per-row
+            # membership checks and memory stays O(distinct models).
+            # DynamoDB numbers arrive as Decimal, so sums stay in Decimal
+            # and convert to float exactly once at the return boundary —
+            # no per-row casts and no float rounding drift along the way
+            zero = Decimal(0)
+            breakdown = defaultdict(lambda: [Decimal(0), Decimal(0), Decimal(0)])
+            for future in futures:
+                for item in future.result():
+                    b = breakdown[item.get('model', 'unknown')]
+                    b[0] += item.get('cost_usd', zero)
+                    b[1] += item.get('tokens_used', zero)
+                    # Rollup rows carry an explicit call count; a raw
+                    # record from the pre-rollup fallback is one call
+                    b[2] += item.get('calls', 1)
+
+            model_breakdown = {
+                model: {'cost': float(b[0]), 'tokens': int(b[1]), 'calls': int(b[2])}
+                for model, b in breakdown.items()
+            }
+            total_cost = sum((b[0] for b in breakdown.values()), zero)
             return {
                 'organization_id': organization_id,
                 'period_days': days,
-                'total_cost_usd': round(total_cost, 2),
-                'total_tokens': total_tokens,
-                'total_calls': len(items),
+                'total_cost_usd': float(total_cost.quantize(Decimal('0.01'))),
+                'total_tokens': int(sum(b[1] for b in breakdown.values())),
+                'total_calls': int(sum(b[2] for b in breakdown.values())),
                 'model_breakdown': model_breakdown
             }
         except Exception as e:
             logger.error(f"Failed to get API usage summary: {str(e)}")
             raise
+
+
+# Process-wide client built lazily so importing this module stays cheap;
+# handlers that construct their own instance still share the transport
+# pool via _BOTO_CONFIG
+_default_client_lock = threading.Lock()
+_default_client: Optional[DynamoDBClient] = None
+
+
+def get_default_client() -> DynamoDBClient:
+    """Get the shared process-wide DynamoDB client.
+
+    Returns:
+        Singleton DynamoDBClient reused across warm invocations
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = DynamoDBClient()
+    return _default_client
+
+
+class UsageBuffer:
+    """Background-batched ingest path for API usage records.
+
+    Records queue here and a daemon thread flushes them once 25 have
+    accumulated or 200ms has passed, whichever comes first. The raw
+    records go out through one batch_writer instead of a put_item per
+    call, and the rollup/month-spend counters coalesce into a single
+    ADD per (organization, model) rather than one per record.
+
+    Lambda freezes background threads between invocations, so handlers
+    using the buffered path must call flush() before returning; the
+    atexit hook only covers container shutdown.
+    """
+
+    def __init__(self, db_client: Optional[DynamoDBClient] = None,
+                 max_batch: int = 25, max_delay: float = 0.2):
+        self._db = db_client
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self.q: queue.Queue = queue.Queue()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def put(self, organization_id: str, usage_data: Dict[str, Any]) -> None:
+        """Queue one usage record for the next background flush.
+
+        Args:
+            organization_id: Organization ID
+            usage_data: Usage information (api_provider, model, tokens_used, cost_usd)
+        """
+        self.q.put((organization_id, dict(usage_data)))
+
+    def flush(self) -> None:
+        """Synchronously write everything currently queued.
+
+        Safe to call from request code; the drain thread and explicit
+        flushes serialize on an internal lock.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self.q.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+
+    def _client(self) -> DynamoDBClient:
+        if self._db is None:
+            self._db = get_default_client()
+        return self._db
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self.q.get()]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        try:
+            with self._flush_lock:
+                db = self._client()
+                now = time.time()
+                date = _today(now)
+                ttl = int(now) + _NINETY_DAYS_S
+                last_timestamp = 0
+                rollups: Dict[tuple, List] = defaultdict(
+                    lambda: [Decimal(0), 0, 0])
+                spend: Dict[str, Decimal] = defaultdict(lambda: Decimal(0))
+                with db.api_usage_table.batch_writer() as writer:
+                    for organization_id, usage_data in batch:
+                        # Millisecond timestamps collide within a burst;
+                        # bump to keep the (partition, sort key) unique
+                        timestamp = max(_now_ms(), last_timestamp + 1)
+                        last_timestamp = timestamp
+                        writer.put_item(Item={
+                            'organization_id': organization_id,
+                            'organization_id_date': _org_date_key(
+                                organization_id, date),
+                            'timestamp': timestamp,
+                            'date': date,
+                            'ttl': ttl,
+                            **usage_data
+                        })
+                        model = str(usage_data.get('model', 'unknown'))
+                        totals = rollups[(organization_id, model)]
+                        totals[0] += Decimal(str(usage_data.get('cost_usd', 0)))
+                        totals[1] += int(usage_data.get('tokens_used', 0))
+                        totals[2] += 1
+                        cost = usage_data.get('cost_usd', 0)
+                        if cost:
+                            spend[organization_id] += Decimal(str(cost))
+                for (organization_id, model), (cost, tokens, calls) in rollups.items():
+                    db._increment_usage_rollup(
+                        organization_id, date, model, cost, tokens, calls, ttl)
+                for organization_id, cost in spend.items():
+                    db._increment_month_spend(organization_id, cost)
+        except Exception as e:
+            logger.error(f"Failed to flush buffered API usage: {str(e)}")
+
+
+_usage_buffer_lock = threading.Lock()
+_usage_buffer: Optional[UsageBuffer] = None
+
+
+def get_usage_buffer() -> UsageBuffer:
+    """Get the shared process-wide usage buffer.
+
+    Returns:
+        Singleton UsageBuffer whose drain thread starts on first use
+    """
+    global _usage_buffer
+    if _usage_buffer is None:
+        with _usage_buffer_lock:
+            if _usage_buffer is None:
+                _usage_buffer = UsageBuffer()
+    return _usage_buffer
@@ -0,0 +1,29 @@
+"""JSON helpers backed by orjson when available.
+
+Shared by JSON-hot paths (secret parsing, webhook payloads, structured
+logging) so they all get the faster parser without repeating the
+optional-dependency handling.
+"""
+from typing import Any, Union
+
+try:
+    import orjson
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from a string or bytes."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from a string or bytes."""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string."""
+        return json.dumps(obj)
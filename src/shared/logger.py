@@ -1,35 +1,41 @@
 """Centralized logging configuration."""
+import atexit
+import functools
 import logging
+import logging.handlers
 import json
+import queue
 import sys
+from datetime import datetime
 from typing import Any, Dict
 from .config import Config
+from .fastjson import dumps as _json_dumps
 
+# Resolved once; setup_logger runs at import time of every module
+_LEVEL = getattr(logging, Config.LOG_LEVEL)
 
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str) -> logging.Logger:
     """Set up structured logging for Lambda functions.
-    
+
+    Memoized per name: repeat calls are a cache hit instead of
+    re-clearing and re-attaching handlers on a live logger.
+
     Args:
         name: Logger name (usually __name__)
-        
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, Config.LOG_LEVEL))
-    
-    # Remove existing handlers
-    logger.handlers = []
-    
-    # Create console handler with structured JSON format
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(getattr(logging, Config.LOG_LEVEL))
-    
-    # Use JSON formatter for CloudWatch
-    formatter = StructuredFormatter()
-    handler.setFormatter(formatter)
-    
-    logger.addHandler(handler)
+    logger.setLevel(_LEVEL)
+
+    # Guard rather than clear, so a logger configured elsewhere keeps
+    # its handlers and we never double-attach
+    if not logger.handlers:
+        logger.addHandler(_queue_handler)
+
     return logger
 
 
@@ -39,19 +45,57 @@ class StructuredFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data: Dict[str, Any] = {
-            'timestamp': self.formatTime(record),
+            # record.created is already an epoch float; isoformat on it
+            # is cheaper than formatTime's strftime round trip
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(
+                sep=' ', timespec='milliseconds'),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
         }
-        
+
         # Add exception info if present
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
-        
+
         # Add extra fields
         if hasattr(record, 'extra'):
             log_data.update(record.extra)
-        
-        return json.dumps(log_data)
+
+        try:
+            # fastjson serializes via orjson's C encoder when available
+            return _json_dumps(log_data)
+        except TypeError:
+            # Extra fields can carry arbitrary objects; never let a log
+            # call raise over serialization
+            return json.dumps(log_data, default=str)
+
+
+class _PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unmodified.
+
+    The stock prepare() pre-formats the message and strips exc_info so
+    records can cross process boundaries; this queue stays in-process,
+    so deferring every bit of formatting to the listener keeps the hot
+    path to a plain enqueue and preserves exception info for the JSON
+    formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Log calls on the request path only enqueue the record; JSON
+# serialization and the stdout write happen on the listener's thread
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = _PassthroughQueueHandler(_log_queue)
+_queue_handler.setLevel(_LEVEL)
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(StructuredFormatter())
+
+_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+_listener.start()
+# stop() drains the queue before the interpreter exits
+atexit.register(_listener.stop)
 
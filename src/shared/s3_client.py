@@ -1,19 +1,172 @@
 """S3 client wrapper for email storage operations."""
 import boto3
-from typing import Optional, BinaryIO
+import functools
+import hashlib
+import hmac
+import time
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotocoreConfig
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+from io import BytesIO
+from typing import Any, Dict, List, Optional, BinaryIO, Union
+from urllib.parse import quote
 from .config import Config
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Feeds S3 streaming bodies straight into the parser; see get_email_parsed
+_BYTES_PARSER = BytesParser(policy=policy.default)
+
+# Attachments above this size upload as parallel multipart chunks; a
+# single put_object serializes the whole body through one PUT
+_MULTIPART_THRESHOLD = 8 << 20
+
+# S3 PUTs are network-bound; a shared pool lets independent attachment
+# uploads overlap instead of queueing behind each other
+_upload_executor = ThreadPoolExecutor(max_workers=8)
+
+# Keep-alive skips per-request TLS handshakes on warm containers; the
+# pool is sized past the upload workers plus the transfer manager's
+# part concurrency so parallel uploads never queue on a connection
+_BOTO_CONFIG = BotocoreConfig(
+    tcp_keepalive=True,
+    max_pool_connections=20,
+    retries={'mode': 'standard'}
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session():
+    """Build the process-wide boto3 session once."""
+    return boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_s3_client():
+    """Build the process-wide boto3 S3 client once.
+
+    Client construction re-parses credentials and compiles the service
+    model (tens of ms), so every S3Client() instantiation in a warm
+    container was paying it again. A dedicated Session also keeps the
+    transfer manager's upload threads off the default-session lock.
+
+    Returns:
+        Shared low-level S3 client
+    """
+    return _get_session().client('s3', config=_BOTO_CONFIG,
+                                 **Config.get_boto3_config())
+
+
+def _read_body(response) -> bytes:
+    """Read a get_object streaming body into one pre-sized buffer.
+
+    Body.read() with no hint accumulates chunks and joins them at the
+    end, so a 5MB download briefly holds every chunk plus the result.
+    ContentLength lets the final buffer be allocated once and filled
+    in place through a memoryview.
+    """
+    size = response.get('ContentLength')
+    body = response['Body']
+    try:
+        if not size:
+            return body.read()
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
+            chunk = body.read(min(1 << 20, size - offset))
+            if not chunk:
+                break
+            view[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        view.release()
+        return bytes(buf[:offset]) if offset != size else bytes(buf)
+    finally:
+        body.close()
+
+
+@functools.lru_cache(maxsize=8)
+def _signing_key(secret_key: str, datestamp: str, region: str) -> bytes:
+    """Derive the SigV4 signing key; it only changes with the date.
+
+    The four-step HMAC chain is identical for every URL signed on the
+    same day, so caching it leaves one hash of the string-to-sign as the
+    whole per-URL cost.
+    """
+    key = hmac.new(('AWS4' + secret_key).encode(), datestamp.encode(),
+                   hashlib.sha256).digest()
+    key = hmac.new(key, region.encode(), hashlib.sha256).digest()
+    key = hmac.new(key, b's3', hashlib.sha256).digest()
+    return hmac.new(key, b'aws4_request', hashlib.sha256).digest()
+
+
+def _presign_get(bucket: str, key: str, credentials, expiration: int) -> str:
+    """Presign a GET for an S3 object locally with SigV4.
+
+    botocore's generate_presigned_url walks the event system, operation
+    model and request serializer on every call; the signature itself is
+    deterministic from (bucket, key, time, credentials), so computing it
+    with hmac/hashlib directly cuts the per-URL cost to a few hashes.
+
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        credentials: Frozen botocore credentials
+        expiration: URL lifetime in seconds
+
+    Returns:
+        Presigned virtual-hosted-style URL
+    """
+    region = Config.AWS_REGION
+    host = f"{bucket}.s3.{region}.amazonaws.com"
+    path = '/' + quote(key, safe='/~')
+    now = time.gmtime()
+    amz_date = time.strftime('%Y%m%dT%H%M%SZ', now)
+    datestamp = amz_date[:8]
+    scope = f"{datestamp}/{region}/s3/aws4_request"
+
+    params = [
+        ('X-Amz-Algorithm', 'AWS4-HMAC-SHA256'),
+        ('X-Amz-Credential', quote(f"{credentials.access_key}/{scope}", safe='~')),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expiration)),
+    ]
+    if credentials.token:
+        params.append(('X-Amz-Security-Token', quote(credentials.token, safe='~')))
+    params.append(('X-Amz-SignedHeaders', 'host'))
+    query = '&'.join(f"{name}={value}" for name, value in params)
+
+    canonical_request = (
+        f"GET\n{path}\n{query}\nhost:{host}\n\nhost\nUNSIGNED-PAYLOAD"
+    )
+    string_to_sign = (
+        "AWS4-HMAC-SHA256\n"
+        f"{amz_date}\n{scope}\n"
+        f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+    )
+    signature = hmac.new(
+        _signing_key(credentials.secret_key, datestamp, region),
+        string_to_sign.encode(), hashlib.sha256).hexdigest()
+    return f"https://{host}{path}?{query}&X-Amz-Signature={signature}"
+
 
 class S3Client:
     """Wrapper for S3 operations."""
-    
+
     def __init__(self):
         """Initialize S3 client."""
-        self.client = boto3.client('s3', **Config.get_boto3_config())
+        self.client = _get_s3_client()
         self.bucket = Config.EMAIL_BUCKET
+        self._transfer_config = TransferConfig(
+            multipart_threshold=_MULTIPART_THRESHOLD,
+            multipart_chunksize=_MULTIPART_THRESHOLD,
+            max_concurrency=8,
+            use_threads=True
+        )
     
     def get_email(self, object_key: str) -> bytes:
         """Retrieve email from S3.
@@ -28,38 +181,145 @@ class S3Client:
             Exception: If email cannot be retrieved
         """
         try:
-            logger.info(f"Retrieving email from S3: {object_key}")
+            logger.info("Retrieving email from S3: %s", object_key)
             response = self.client.get_object(Bucket=self.bucket, Key=object_key)
-            return response['Body'].read()
+            return _read_body(response)
         except Exception as e:
-            logger.error(f"Failed to retrieve email from S3: {str(e)}")
+            logger.error("Failed to retrieve email from S3: %s", e)
             raise
     
-    def store_attachment(self, key: str, data: bytes, content_type: str = 'application/octet-stream') -> str:
+    def get_email_parsed(self, object_key: str) -> EmailMessage:
+        """Retrieve an email and parse it straight off the stream.
+
+        get_email buffers the whole object as bytes and callers then
+        hand that buffer to the parser, holding ~2x the message in RAM.
+        Feeding the streaming body into BytesParser keeps only the
+        parser's feed window live, which matters for multi-MB emails.
+
+        Args:
+            object_key: S3 object key
+
+        Returns:
+            Parsed EmailMessage object
+        """
+        try:
+            logger.info("Retrieving and parsing email from S3: %s", object_key)
+            body = self.client.get_object(Bucket=self.bucket, Key=object_key)['Body']
+            try:
+                return _BYTES_PARSER.parse(body)
+            finally:
+                body.close()
+        except Exception as e:
+            logger.error("Failed to retrieve and parse email from S3: %s", e)
+            raise
+
+    def get_email_headers(self, object_key: str, bytes_hint: int = 16384) -> bytes:
+        """Retrieve only the leading bytes of a stored email.
+
+        Header-only consumers (auto-reply checks, sender validation)
+        don't need the multi-MB bodies that attachments produce; a
+        ranged GET transfers just the prefix. The window doubles until
+        the blank line ending the header block has arrived, so a short
+        hint stays correct on emails with long header chains.
+
+        Args:
+            object_key: S3 object key
+            bytes_hint: Initial number of bytes to fetch
+
+        Returns:
+            Raw leading bytes containing at least the full header block
+        """
+        try:
+            logger.info("Retrieving email headers from S3: %s", object_key)
+            window = bytes_hint
+            while True:
+                response = self.client.get_object(
+                    Bucket=self.bucket,
+                    Key=object_key,
+                    Range=f'bytes=0-{window - 1}'
+                )
+                data = response['Body'].read()
+                # Whole object fit in the window, or the header/body
+                # separator is present: the header block is complete
+                if len(data) < window or b'\r\n\r\n' in data or b'\n\n' in data:
+                    return data
+                window *= 2
+        except Exception as e:
+            logger.error("Failed to retrieve email headers from S3: %s", e)
+            raise
+
+    def store_attachment(self, key: str, data: Union[bytes, memoryview],
+                         content_type: str = 'application/octet-stream') -> str:
         """Store email attachment in S3.
-        
+
+        Accepts any bytes-like object; callers holding a memoryview over
+        a larger buffer can pass it straight through — both put_object
+        and BytesIO take buffers without copying first.
+
         Args:
             key: S3 object key
-            data: Attachment data
+            data: Attachment data (bytes or a view over them)
             content_type: MIME type of attachment
-            
+
         Returns:
             S3 object key
         """
         try:
-            logger.info(f"Storing attachment to S3: {key}")
-            self.client.put_object(
-                Bucket=self.bucket,
-                Key=f"attachments/{key}",
-                Body=data,
-                ContentType=content_type,
-                ServerSideEncryption='AES256'
-            )
+            logger.info("Storing attachment to S3: %s", key)
+            if len(data) > _MULTIPART_THRESHOLD:
+                # The transfer manager splits large bodies into parallel
+                # part uploads, so bandwidth-bound attachments saturate
+                # the link instead of trickling through one PUT
+                self.client.upload_fileobj(
+                    BytesIO(data),
+                    self.bucket,
+                    f"attachments/{key}",
+                    ExtraArgs={
+                        'ContentType': content_type,
+                        'ServerSideEncryption': 'AES256'
+                    },
+                    Config=self._transfer_config
+                )
+            else:
+                self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=f"attachments/{key}",
+                    Body=data,
+                    ContentType=content_type,
+                    ServerSideEncryption='AES256'
+                )
             return f"attachments/{key}"
         except Exception as e:
-            logger.error(f"Failed to store attachment: {str(e)}")
+            logger.error("Failed to store attachment: %s", e)
             raise
     
+    def store_attachments_batch(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Store multiple attachments concurrently.
+
+        Emails often carry several attachments; uploading them through
+        the shared pool scales throughput almost linearly with count
+        instead of serializing one PUT after another.
+
+        Args:
+            items: Dicts with 'key', 'data', and optional 'content_type'
+
+        Returns:
+            S3 object keys, in input order
+        """
+        try:
+            futures = [
+                _upload_executor.submit(
+                    self.store_attachment,
+                    item['key'],
+                    item['data'],
+                    item.get('content_type', 'application/octet-stream'))
+                for item in items
+            ]
+            return [future.result() for future in futures]
+        except Exception as e:
+            logger.error("Failed to store attachment batch: %s", e)
+            raise
+
     def get_attachment(self, key: str) -> bytes:
         """Retrieve attachment from S3.
         
@@ -71,9 +331,9 @@ class S3Client:
         """
         try:
             response = self.client.get_object(Bucket=self.bucket, Key=key)
-            return response['Body'].read()
+            return _read_body(response)
         except Exception as e:
-            logger.error(f"Failed to retrieve attachment: {str(e)}")
+            logger.error("Failed to retrieve attachment: %s", e)
             raise
     
     def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
@@ -87,6 +347,14 @@ class S3Client:
             Presigned URL
         """
         try:
+            # Non-AWS endpoints (LocalStack) keep the botocore path, which
+            # knows how to address them; real S3 signs locally
+            if not (Config.USE_LOCALSTACK and Config.AWS_ENDPOINT_URL):
+                credentials = _get_session().get_credentials()
+                if credentials is not None:
+                    return _presign_get(self.bucket, key,
+                                        credentials.get_frozen_credentials(),
+                                        expiration)
             url = self.client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket, 'Key': key},
@@ -94,6 +362,6 @@ class S3Client:
             )
             return url
         except Exception as e:
-            logger.error(f"Failed to generate presigned URL: {str(e)}")
+            logger.error("Failed to generate presigned URL: %s", e)
             raise
 
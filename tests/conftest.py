@@ -1,8 +1,19 @@
 """Pytest configuration and shared fixtures."""
+import base64
+import copy
+import functools
+import itertools
 import pytest
 import os
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+# src/ and tests/ reach sys.path via the pythonpath option in pytest.ini,
+# which pytest applies once before collection — no import-time mutation here
+
 # Load test environment variables
 load_dotenv('.env.test', override=True)
 
@@ -25,6 +36,353 @@ def aws_credentials():
     os.environ['AWS_SESSION_TOKEN'] = 'testing'
 
 
+@pytest.fixture(scope="session")
+def _moto():
+    """Start moto's DynamoDB backend once for the whole session.
+
+    Entering the mock patches boto3's endpoint resolver — the priciest
+    part of a per-test fixture — so it runs exactly once; module
+    fixtures create tables and per-test fixtures wipe items.
+    """
+    try:
+        # moto 5 unified decorator; fall back to the moto 4 per-service one
+        from moto import mock_aws as mock_dynamodb
+    except ImportError:
+        from moto import mock_dynamodb
+    from shared.config import Config
+
+    # Patch Config to not use LocalStack endpoint for moto tests
+    # (session-scoped, so pytest's function-scoped monkeypatch won't do)
+    mp = pytest.MonkeyPatch()
+    mp.setattr(Config, 'USE_LOCALSTACK', False)
+    mp.setattr(Config, 'AWS_ENDPOINT_URL', None)
+
+    # Namespace table names per xdist worker. Each worker's moto backend
+    # is process-local, so this is defence in depth: no collisions if a
+    # backend ever becomes shared (e.g. LocalStack), and failure output
+    # shows which worker owned the table
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+    for attr in ('ORGANIZATIONS_TABLE', 'PROJECTS_TABLE', 'EVENTS_TABLE',
+                 'USERS_TABLE', 'API_USAGE_TABLE'):
+        mp.setattr(Config, attr, f"{getattr(Config, attr)}-{worker}")
+
+    m = mock_dynamodb()
+    m.start()
+    yield
+    m.stop()
+    mp.undo()
+
+
+@functools.lru_cache(maxsize=64)
+def email_bytes(body='Test body', headers=(), attachments=(), html=None):
+    """Serialized MIME message, memoized per distinct shape.
+
+    Construction plus the recursive as_bytes() walk dominates small
+    parser tests, so any shape that recurs within a run is built once.
+    headers and attachments are tuples of tuples to keep the cache key
+    hashable.
+    """
+    if attachments:
+        msg = MIMEMultipart()
+        msg.attach(MIMEText(body))
+        for filename, content, content_type in attachments:
+            attach_bytes(msg, filename, content, content_type)
+    elif html is not None:
+        msg = MIMEMultipart('alternative')
+        msg.attach(MIMEText(body))
+        msg.attach(MIMEText(html, 'html'))
+    else:
+        msg = MIMEText(body)
+    for name, value in headers:
+        msg[name] = value
+    return msg.as_bytes()
+
+
+def attach_bytes(msg, filename, content, content_type):
+    """Attach raw bytes to a MIME message with one direct base64 encode.
+
+    encoders.encode_base64 re-reads an already-set payload and rewrites
+    it through get_payload/set_payload; encoding once up front halves
+    the copies per attachment.
+    """
+    # partition returns a tuple, skipping split's list allocation
+    maintype, _, subtype = content_type.partition('/')
+    part = MIMEBase(maintype, subtype)
+    part.set_payload(base64.b64encode(content).decode('ascii'))
+    part.add_header('Content-Transfer-Encoding', 'base64')
+    part.add_header('Content-Disposition', 'attachment', filename=filename)
+    msg.attach(part)
+    return part
+
+
+def _table_schemas():
+    """Multi-tenant test DDL, mirroring infrastructure/create_tables.py.
+
+    Built at call time so the table names reflect the per-worker
+    suffixes applied by the _moto fixture.
+    """
+    from shared.config import Config
+
+    return [
+        dict(
+            TableName=Config.ORGANIZATIONS_TABLE,
+            KeySchema=[
+                {'AttributeName': 'organization_id', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'organization_id', 'AttributeType': 'S'},
+                {'AttributeName': 'email_address', 'AttributeType': 'S'},
+                {'AttributeName': 'subdomain', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'email_address-index',
+                    'KeySchema': [{'AttributeName': 'email_address', 'KeyType': 'HASH'}],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'subdomain-index',
+                    'KeySchema': [{'AttributeName': 'subdomain', 'KeyType': 'HASH'}],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ]
+        ),
+        dict(
+            TableName=Config.PROJECTS_TABLE,
+            KeySchema=[
+                {'AttributeName': 'organization_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'project_id_created_at', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'organization_id', 'AttributeType': 'S'},
+                {'AttributeName': 'project_id_created_at', 'AttributeType': 'S'},
+                {'AttributeName': 'client_email', 'AttributeType': 'S'},
+                {'AttributeName': 'status', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'client_email-index',
+                    'KeySchema': [{'AttributeName': 'client_email', 'KeyType': 'HASH'}],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'organization_id-status-index',
+                    'KeySchema': [
+                        {'AttributeName': 'organization_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'status', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ]
+        ),
+        dict(
+            TableName=Config.EVENTS_TABLE,
+            KeySchema=[
+                {'AttributeName': 'organization_id_project_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'event_timestamp', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'organization_id_project_id', 'AttributeType': 'S'},
+                {'AttributeName': 'event_timestamp', 'AttributeType': 'N'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        ),
+        dict(
+            TableName=Config.USERS_TABLE,
+            KeySchema=[
+                {'AttributeName': 'user_email', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'user_email', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        ),
+        dict(
+            TableName=Config.API_USAGE_TABLE,
+            KeySchema=[
+                {'AttributeName': 'organization_id_date', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'organization_id_date', 'AttributeType': 'S'},
+                {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+                {'AttributeName': 'organization_id', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'organization_id-index',
+                'KeySchema': [
+                    {'AttributeName': 'organization_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }]
+        ),
+    ]
+
+
+def create_test_tables(dynamodb):
+    """Create the test tables concurrently; returns their names.
+
+    Each create_table call runs moto's full validation and GSI
+    expansion in Python, so issuing them concurrently costs roughly
+    one table's worth of wall time instead of one per table.
+    """
+    schemas = _table_schemas()
+    with ThreadPoolExecutor(max_workers=len(schemas)) as ex:
+        list(ex.map(lambda schema: dynamodb.create_table(**schema), schemas))
+    return [schema['TableName'] for schema in schemas]
+
+
+def table_savepoint(*specs):
+    """Snapshot table items before a test and restore them after.
+
+    Generator helper for ``yield from`` inside per-test fixtures.
+    Swapping the saved item dict back in costs O(items the test wrote)
+    instead of a scan + delete of everything, and it runs whether the
+    test passed or failed, so a failing test can't leak rows into the
+    tests after it. Falls back to wipe_tables() if moto's internals are
+    unavailable.
+    """
+    from shared.config import Config
+
+    try:
+        from moto.core import DEFAULT_ACCOUNT_ID
+        from moto.dynamodb.models import dynamodb_backends
+
+        backend = dynamodb_backends[DEFAULT_ACCOUNT_ID][Config.AWS_REGION]
+        tables = {name: backend.tables[name] for name, _ in specs}
+    except (ImportError, KeyError, AttributeError):
+        yield
+        wipe_tables(*specs)
+        return
+
+    snapshots = {}
+    for name, table in tables.items():
+        # copy.copy keeps the defaultdict factory; values are copied too
+        # so in-place mutation by the test can't bleed into the snapshot
+        snapshot = copy.copy(table.items)
+        snapshot.update({key: copy.copy(value)
+                         for key, value in table.items.items()})
+        snapshots[name] = snapshot
+    yield
+    for name, snapshot in snapshots.items():
+        tables[name].items = snapshot
+
+
+def wipe_tables(*specs):
+    """Rewind moto tables between tests without tearing down DDL.
+
+    Clearing the backend's in-memory item store directly skips the
+    scan + BatchWriteItem round-trips (and their request parsing and
+    validation) that an API-level wipe pays per test. Each spec is a
+    ``(table_name, key_attrs)`` pair; key_attrs are only needed by the
+    API fallback used when moto's internals move.
+    """
+    from shared.config import Config
+
+    try:
+        from moto.core import DEFAULT_ACCOUNT_ID
+        from moto.dynamodb.models import dynamodb_backends
+
+        backend = dynamodb_backends[DEFAULT_ACCOUNT_ID][Config.AWS_REGION]
+        for table_name, _ in specs:
+            backend.tables[table_name].items.clear()
+        return
+    except (ImportError, KeyError, AttributeError):
+        pass
+
+    import boto3
+    dynamodb = boto3.resource('dynamodb', region_name=Config.AWS_REGION)
+    for table_name, key_attrs in specs:
+        table = dynamodb.Table(table_name)
+        with table.batch_writer() as batch:
+            for item in table.scan()['Items']:
+                batch.delete_item(Key={attr: item[attr] for attr in key_attrs})
+
+
+@pytest.fixture(scope="session")
+def _moto_s3():
+    """Start moto's S3 backend once for the whole session.
+
+    Same shape as _moto: one entry pays the boto3 patching cost, module
+    fixtures create buckets and wipe_bucket rewinds objects per test.
+    The bucket name gets the same per-worker suffix as the tables.
+    """
+    try:
+        from moto import mock_aws as mock_s3
+    except ImportError:
+        from moto import mock_s3
+    from shared.config import Config
+
+    mp = pytest.MonkeyPatch()
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+    mp.setattr(Config, 'EMAIL_BUCKET', f"{Config.EMAIL_BUCKET}-{worker}")
+
+    m = mock_s3()
+    m.start()
+    yield
+    m.stop()
+    mp.undo()
+
+
+def wipe_bucket(bucket_name):
+    """Delete every object in a moto bucket between tests.
+
+    Clears the backend's key store directly, skipping the per-object
+    list/delete API round-trips; falls back to delete_objects if moto's
+    internals move.
+    """
+    try:
+        from moto.core import DEFAULT_ACCOUNT_ID
+        from moto.s3.models import s3_backends
+
+        bucket = s3_backends[DEFAULT_ACCOUNT_ID]['global'].buckets[bucket_name]
+        for key in list(bucket.keys):
+            del bucket.keys[key]
+        return
+    except (ImportError, KeyError, AttributeError):
+        pass
+
+    import boto3
+    from shared.config import Config
+    client = boto3.client('s3', region_name=Config.AWS_REGION)
+    contents = client.list_objects_v2(Bucket=bucket_name).get('Contents', [])
+    if contents:
+        client.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': [{'Key': obj['Key']} for obj in contents]})
+
+
+@pytest.fixture(scope="session")
+def db_client(_moto):
+    """One DynamoDBClient for the whole session.
+
+    __init__ builds a boto3 session, resource and client — ~100ms of
+    service-model loading that per-test construction repeated for every
+    case. The instance holds no test state, so one is enough.
+    """
+    from shared.db_client import DynamoDBClient
+
+    return DynamoDBClient()
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Make every db_client timestamp strictly increasing without sleeping.
+
+    Tests that only need distinct created_at/event_timestamp values used
+    to time.sleep between writes; advancing a counter by 1ms per clock
+    read gives the same ordering guarantees in zero wall time.
+    """
+    from shared import db_client
+
+    counter = itertools.count(db_client._now_ms(), 1)
+    monkeypatch.setattr(db_client, '_now_ms', lambda: next(counter))
+
+
 @pytest.fixture
 def use_moto(monkeypatch):
     """Fixture to ensure moto tests don't try to use LocalStack."""
@@ -0,0 +1,84 @@
+"""In-memory test doubles for AWS-backed clients.
+
+moto's boto3 patching costs hundreds of ms to start; tests that only
+verify CRUD semantics (create returns an id, get returns what was
+stored) can run against these dict-backed fakes in microseconds. Keep
+moto for tests that assert backend behavior such as GSI queries.
+"""
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Any, Optional, List
+
+from shared.db_client import DynamoDBClient
+
+
+class InMemoryDynamoDBClient(DynamoDBClient):
+    """Dict-backed stand-in mirroring DynamoDBClient's CRUD contract.
+
+    Signatures and validation match the real client so tests written
+    against the fake stay valid against DynamoDB.
+    """
+
+    def __init__(self):
+        # Deliberately skip DynamoDBClient.__init__: no boto3 resources
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._users: Dict[str, Dict[str, Any]] = {}
+
+    def create_project(self, organization_id: str, project_data: Dict[str, Any]) -> str:
+        if not organization_id:
+            raise ValueError("organization_id is required")
+        project_id = f"PROJ-{uuid.uuid4().hex[:12].upper()}"
+        item = dict(project_data)
+        item.update({
+            'project_id': project_id,
+            'organization_id': organization_id,
+            'created_at': int(time.time() * 1000)
+        })
+        self._projects[f"{organization_id}#{project_id}"] = item
+        return project_id
+
+    def create_projects_bulk(self, organization_id: str,
+                             projects: List[Dict[str, Any]]) -> List[str]:
+        return [self.create_project(organization_id, project_data)
+                for project_data in projects]
+
+    def get_project(self, organization_id: str, project_id: str) -> Optional[Dict[str, Any]]:
+        return self._projects.get(f"{organization_id}#{project_id}")
+
+    def create_event(self, organization_id: str, project_id: str, event_data: Dict[str, Any],
+                     **kwargs) -> str:
+        if not organization_id:
+            raise ValueError("organization_id is required")
+        event_id = str(uuid.uuid4())
+        item = dict(event_data)
+        item.update({
+            'event_id': event_id,
+            'project_id': project_id,
+            'organization_id': organization_id,
+            'event_timestamp': int(time.time() * 1000)
+        })
+        self._events[f"{organization_id}#{project_id}"].append(item)
+        return event_id
+
+    def create_events_bulk(self, organization_id: str, project_id: str,
+                           events: List[Dict[str, Any]], **kwargs) -> List[str]:
+        return [self.create_event(organization_id, project_id, event_data)
+                for event_data in events]
+
+    def get_project_events(self, organization_id: str, project_id: str,
+                           limit: int = 100, **kwargs) -> List[Dict[str, Any]]:
+        return self._events[f"{organization_id}#{project_id}"][:limit]
+
+    def create_user(self, user_data: Dict[str, Any]) -> None:
+        if not user_data.get('organization_id'):
+            raise ValueError("organization_id is required")
+        self._users[user_data['user_email']] = dict(user_data)
+
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> None:
+        for user_data in users:
+            self.create_user(user_data)
+
+    def get_user(self, user_email: str) -> Optional[Dict[str, Any]]:
+        return self._users.get(user_email)
@@ -1,86 +1,50 @@
 """
 Unit tests for DynamoDB client.
-These tests use moto to mock DynamoDB.
+Pure-CRUD cases run against the dict-backed InMemoryDynamoDBClient from
+tests/fakes.py; only tests that depend on real query semantics (GSI
+lookups) still run against moto.
 """
 import pytest
 import boto3
-from moto import mock_dynamodb
 import sys
 import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
-
-from shared.db_client import DynamoDBClient
 from shared.config import Config
+from conftest import create_test_tables, table_savepoint
+from fakes import InMemoryDynamoDBClient
+
+# Tenant partition shared by every test in this module; the client API
+# is organization-scoped throughout
+ORG_ID = 'ORG-test'
+
+
+@pytest.fixture(scope="module")
+def _tables(_moto):
+    """Create the shared test tables once per module; DDL dominates setup time."""
+    dynamodb = boto3.client('dynamodb', region_name='us-east-1')
+    table_names = create_test_tables(dynamodb)
+
+    yield
+
+    for table_name in table_names:
+        dynamodb.delete_table(TableName=table_name)
 
 
 @pytest.fixture
-def dynamodb_setup(monkeypatch):
-    """Set up mock DynamoDB tables."""
-    # Patch Config to not use LocalStack endpoint for moto tests
-    monkeypatch.setattr(Config, 'USE_LOCALSTACK', False)
-    monkeypatch.setattr(Config, 'AWS_ENDPOINT_URL', None)
-    
-    with mock_dynamodb():
-        # Create mock tables  
-        dynamodb = boto3.client('dynamodb', region_name='us-east-1')
-        
-        # Projects table
-        dynamodb.create_table(
-            TableName=Config.PROJECTS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'project_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'project_id', 'AttributeType': 'S'},
-                {'AttributeName': 'created_at', 'AttributeType': 'N'},
-                {'AttributeName': 'client_email', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST',
-            GlobalSecondaryIndexes=[{
-                'IndexName': 'client_email-index',
-                'KeySchema': [{'AttributeName': 'client_email', 'KeyType': 'HASH'}],
-                'Projection': {'ProjectionType': 'ALL'}
-            }]
-        )
-        
-        # Events table
-        dynamodb.create_table(
-            TableName=Config.EVENTS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'project_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'event_timestamp', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'project_id', 'AttributeType': 'S'},
-                {'AttributeName': 'event_timestamp', 'AttributeType': 'N'}
-            ],
-            BillingMode='PAY_PER_REQUEST'
-        )
-        
-        # Users table
-        dynamodb.create_table(
-            TableName=Config.USERS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'user_email', 'KeyType': 'HASH'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'user_email', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST'
-        )
-        
-        yield
+def _clean_tables(_tables):
+    """Savepoint table items around each test; the DDL stays up for the module."""
+    yield from table_savepoint(
+        (Config.PROJECTS_TABLE, ('organization_id', 'project_id_created_at')),
+        (Config.EVENTS_TABLE, ('organization_id_project_id', 'event_timestamp')),
+        (Config.USERS_TABLE, ('user_email',)))
 
 
 class TestDynamoDBClient:
     """Test cases for DynamoDBClient."""
     
-    def test_create_project(self, dynamodb_setup):
+    def test_create_project(self):
         """Test project creation."""
-        client = DynamoDBClient()
+        client = InMemoryDynamoDBClient()
         
         project_data = {
             'client_email': 'test@example.com',
@@ -88,50 +52,49 @@ class TestDynamoDBClient:
             'project_name': 'Test Project'
         }
         
-        project_id = client.create_project(project_data)
+        project_id = client.create_project(ORG_ID, project_data)
         
         assert project_id.startswith('PROJ-')
     
-    def test_get_project(self, dynamodb_setup):
+    def test_get_project(self):
         """Test project retrieval."""
-        client = DynamoDBClient()
+        client = InMemoryDynamoDBClient()
         
         # Create project
         project_data = {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
         }
-        project_id = client.create_project(project_data)
+        project_id = client.create_project(ORG_ID, project_data)
         
         # Retrieve project
-        project = client.get_project(project_id)
+        project = client.get_project(ORG_ID, project_id)
         
         assert project is not None
         assert project['project_id'] == project_id
         assert project['project_name'] == 'Test Project'
     
-    def test_get_projects_by_client(self, dynamodb_setup):
+    def test_get_projects_by_client(self, _clean_tables, db_client):
         """Test retrieving projects by client email."""
-        client = DynamoDBClient()
+        client = db_client
         
-        # Create multiple projects
-        for i in range(3):
-            client.create_project({
-                'client_email': 'test@example.com',
-                'project_name': f'Project {i}'
-            })
+        # Create multiple projects in one batched write
+        client.create_projects_bulk(ORG_ID, [
+            {'client_email': 'test@example.com', 'project_name': f'Project {i}'}
+            for i in range(3)
+        ])
         
         # Retrieve projects
         projects = client.get_projects_by_client('test@example.com')
         
         assert len(projects) == 3
     
-    def test_create_event(self, dynamodb_setup):
+    def test_create_event(self):
         """Test event creation."""
-        client = DynamoDBClient()
+        client = InMemoryDynamoDBClient()
         
         # Create project
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
         })
@@ -142,38 +105,38 @@ class TestDynamoDBClient:
             'sender': 'test@example.com',
             'subject': 'Test Email'
         }
-        event_id = client.create_event(project_id, event_data)
+        event_id = client.create_event(ORG_ID, project_id, event_data)
         
         assert event_id is not None
     
-    def test_get_project_events(self, dynamodb_setup):
+    def test_get_project_events(self):
         """Test retrieving project events."""
-        client = DynamoDBClient()
+        client = InMemoryDynamoDBClient()
         
         # Create project
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
         })
         
-        # Create multiple events
-        for i in range(3):
-            client.create_event(project_id, {
-                'event_type': 'TEST_EVENT',
-                'data': f'Event {i}'
-            })
+        # Create multiple events in one batched write
+        client.create_events_bulk(ORG_ID, project_id, [
+            {'event_type': 'TEST_EVENT', 'data': f'Event {i}'}
+            for i in range(3)
+        ])
         
         # Retrieve events
-        events = client.get_project_events(project_id)
+        events = client.get_project_events(ORG_ID, project_id)
         
         assert len(events) == 3
     
-    def test_create_user(self, dynamodb_setup):
+    def test_create_user(self):
         """Test user creation."""
-        client = DynamoDBClient()
+        client = InMemoryDynamoDBClient()
         
         user_data = {
             'user_email': 'user@example.com',
+            'organization_id': ORG_ID,
             'company_name': 'Test Company'
         }
         client.create_user(user_data)
@@ -4,93 +4,67 @@ Tests: Projects table, Events table, Users table, all CRUD operations
 """
 import pytest
 import boto3
-from moto import mock_dynamodb
 import sys
 import os
 import time
+from decimal import Decimal
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
-
-from shared.db_client import DynamoDBClient
 from shared.config import Config
+from conftest import create_test_tables, table_savepoint
+
+# Tenant partition shared by every test in this module; the client API
+# is organization-scoped throughout
+ORG_ID = 'ORG-test'
+
+
+@pytest.fixture(scope="module")
+def dynamodb_setup(_moto):
+    """Create the test tables once per module on the shared moto backend.
+
+    Re-entering mock_dynamodb() and re-running the DDL for every test
+    was almost all of this module's runtime; _clean_tables wipes items
+    between tests instead.
+    """
+    dynamodb = boto3.client('dynamodb', region_name='us-east-1')
+    table_names = create_test_tables(dynamodb)
 
+    yield
 
-@pytest.fixture
-def dynamodb_setup():
-    """Set up mock DynamoDB tables."""
-    with mock_dynamodb():
-        dynamodb = boto3.client('dynamodb', region_name='us-east-1')
-        
-        # Projects table
-        dynamodb.create_table(
-            TableName=Config.PROJECTS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'project_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'project_id', 'AttributeType': 'S'},
-                {'AttributeName': 'created_at', 'AttributeType': 'N'},
-                {'AttributeName': 'client_email', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST',
-            GlobalSecondaryIndexes=[{
-                'IndexName': 'client_email-index',
-                'KeySchema': [{'AttributeName': 'client_email', 'KeyType': 'HASH'}],
-                'Projection': {'ProjectionType': 'ALL'}
-            }]
-        )
-        
-        # Events table
-        dynamodb.create_table(
-            TableName=Config.EVENTS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'project_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'event_timestamp', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'project_id', 'AttributeType': 'S'},
-                {'AttributeName': 'event_timestamp', 'AttributeType': 'N'}
-            ],
-            BillingMode='PAY_PER_REQUEST'
-        )
-        
-        # Users table
-        dynamodb.create_table(
-            TableName=Config.USERS_TABLE,
-            KeySchema=[
-                {'AttributeName': 'user_email', 'KeyType': 'HASH'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'user_email', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST'
-        )
-        
-        yield
+    for table_name in table_names:
+        dynamodb.delete_table(TableName=table_name)
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables(dynamodb_setup):
+    """Savepoint table items around each test; the DDL stays up for the module."""
+    yield from table_savepoint(
+        (Config.ORGANIZATIONS_TABLE, ('organization_id',)),
+        (Config.PROJECTS_TABLE, ('organization_id', 'project_id_created_at')),
+        (Config.EVENTS_TABLE, ('organization_id_project_id', 'event_timestamp')),
+        (Config.USERS_TABLE, ('user_email',)),
+        (Config.API_USAGE_TABLE, ('organization_id_date', 'timestamp')))
 
 
 class TestDynamoDBProjects:
     """Test cases for Projects table operations."""
     
-    def test_create_project_minimal(self, dynamodb_setup):
+    def test_create_project_minimal(self, dynamodb_setup, db_client):
         """✅ TEST: Create project with minimal data"""
-        client = DynamoDBClient()
+        client = db_client
         
         project_data = {
             'client_email': 'contractor@example.com',
             'project_name': 'Main Street Renovation'
         }
         
-        project_id = client.create_project(project_data)
+        project_id = client.create_project(ORG_ID, project_data)
         
         assert project_id.startswith('PROJ-'), "Project ID should have PROJ- prefix"
         assert len(project_id) > 10, "Project ID should be sufficiently long"
-        print(f"   ✓ Project created: {project_id}")
     
-    def test_create_project_complete(self, dynamodb_setup):
+    def test_create_project_complete(self, dynamodb_setup, db_client):
         """✅ TEST: Create project with complete data"""
-        client = DynamoDBClient()
+        client = db_client
         
         project_data = {
             'client_email': 'contractor@example.com',
@@ -102,141 +76,119 @@ class TestDynamoDBProjects:
             'trade': 'electrical'
         }
         
-        project_id = client.create_project(project_data)
+        project_id = client.create_project(ORG_ID, project_data)
         
         # Retrieve and verify
-        project = client.get_project(project_id)
+        project = client.get_project(ORG_ID, project_id)
         assert project['project_name'] == 'Downtown Office Building'
         assert project['estimated_budget'] == 500000
         assert project['status'] == 'active'
-        print(f"   ✓ Complete project created: {project['project_name']}")
     
-    def test_get_project(self, dynamodb_setup):
-        """✅ TEST: Retrieve existing project"""
-        client = DynamoDBClient()
+    @pytest.mark.parametrize("exists", [True, False], ids=['existing', 'missing'])
+    def test_get_project(self, dynamodb_setup, db_client, exists):
+        """✅ TEST: Retrieve an existing project, None for a missing one"""
+        client = db_client
         
-        # Create project
-        project_id = client.create_project({
+        project_id = (client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
-        })
-        
-        # Retrieve project
-        project = client.get_project(project_id)
-        
-        assert project is not None, "Project should exist"
-        assert project['project_id'] == project_id
-        assert project['project_name'] == 'Test Project'
-        assert 'created_at' in project
-        assert 'updated_at' in project
-        print("   ✓ Project retrieved successfully")
-    
-    def test_get_project_not_found(self, dynamodb_setup):
-        """✅ TEST: Handle non-existent project"""
-        client = DynamoDBClient()
-        
-        project = client.get_project('PROJ-nonexistent-12345')
-        
-        assert project is None, "Should return None for non-existent project"
-        print("   ✓ Non-existent project handled gracefully")
+        }) if exists else 'PROJ-nonexistent-12345')
+        
+        project = client.get_project(ORG_ID, project_id)
+        
+        if exists:
+            assert project is not None, "Project should exist"
+            assert project['project_id'] == project_id
+            assert project['project_name'] == 'Test Project'
+            assert 'created_at' in project
+            assert 'updated_at' in project
+        else:
+            assert project is None, "Should return None for non-existent project"
     
-    def test_get_projects_by_client(self, dynamodb_setup):
-        """✅ TEST: Retrieve all projects for a client"""
-        client = DynamoDBClient()
+    # Tuples, not lists: the params are fixed data, and tuple literals of
+    # constants are folded to a single LOAD_CONST at compile time
+    @pytest.mark.parametrize("project_names", [
+        ('Project Alpha', 'Project Beta', 'Project Gamma'),
+        (),
+    ], ids=['three', 'none'])
+    def test_get_projects_by_client(self, dynamodb_setup, db_client, project_names):
+        """✅ TEST: Retrieve exactly a client's projects, empty included"""
+        client = db_client
         client_email = 'builder@example.com'
         
-        # Create multiple projects
-        project_names = ['Project Alpha', 'Project Beta', 'Project Gamma']
-        for name in project_names:
-            client.create_project({
-                'client_email': client_email,
-                'project_name': name
-            })
+        # Create the projects (if any) in one batched write
+        client.create_projects_bulk(ORG_ID, [
+            {'client_email': client_email, 'project_name': name}
+            for name in project_names
+        ])
         
-        # Retrieve all projects
-        projects = client.get_projects_by_client(client_email)
+        # Retrieve only the names; the test never reads other attributes
+        projects = client.get_projects_by_client(
+            client_email, attributes=['project_name'])
         
-        assert len(projects) == 3, "Should retrieve all 3 projects"
-        retrieved_names = {p['project_name'] for p in projects}
-        assert retrieved_names == set(project_names)
-        print(f"   ✓ Retrieved {len(projects)} projects for client")
+        assert len(projects) == len(project_names)
+        retrieved_names = frozenset(p['project_name'] for p in projects)
+        assert retrieved_names == frozenset(project_names)
     
-    def test_get_projects_by_client_empty(self, dynamodb_setup):
-        """✅ TEST: Handle client with no projects"""
-        client = DynamoDBClient()
-        
-        projects = client.get_projects_by_client('newclient@example.com')
-        
-        assert len(projects) == 0, "Should return empty list"
-        print("   ✓ Empty project list handled")
-    
-    def test_update_project(self, dynamodb_setup):
+    def test_update_project(self, dynamodb_setup, db_client, fake_clock):
         """✅ TEST: Update project information"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Create project
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Original Name',
             'status': 'active'
         })
         
         # Update project
-        time.sleep(0.1)  # Ensure different timestamp
-        client.update_project(project_id, {
+        client.update_project(ORG_ID, project_id, {
             'project_name': 'Updated Name',
             'status': 'in_progress',
             'estimated_budget': 100000
         })
         
         # Verify updates
-        project = client.get_project(project_id)
+        project = client.get_project(ORG_ID, project_id)
         assert project['project_name'] == 'Updated Name'
         assert project['status'] == 'in_progress'
         assert project['estimated_budget'] == 100000
         assert project['updated_at'] > project['created_at'], "updated_at should be newer"
-        print("   ✓ Project updated successfully")
     
-    def test_update_nonexistent_project(self, dynamodb_setup):
+    def test_update_nonexistent_project(self, dynamodb_setup, db_client):
         """✅ TEST: Handle updating non-existent project"""
-        client = DynamoDBClient()
+        client = db_client
         
         with pytest.raises(ValueError):
-            client.update_project('PROJ-nonexistent', {'status': 'completed'})
-        
-        print("   ✓ Update of non-existent project raises error")
+            client.update_project(ORG_ID, 'PROJ-nonexistent', {'status': 'completed'})
     
-    def test_multiple_clients_projects(self, dynamodb_setup):
+    def test_multiple_clients_projects(self, dynamodb_setup, db_client):
         """✅ TEST: Multiple clients with separate projects"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Client A projects
         client_a = 'clienta@example.com'
-        client.create_project({'client_email': client_a, 'project_name': 'A1'})
-        client.create_project({'client_email': client_a, 'project_name': 'A2'})
+        client.create_project(ORG_ID, {'client_email': client_a, 'project_name': 'A1'})
+        client.create_project(ORG_ID, {'client_email': client_a, 'project_name': 'A2'})
         
         # Client B projects
         client_b = 'clientb@example.com'
-        client.create_project({'client_email': client_b, 'project_name': 'B1'})
+        client.create_project(ORG_ID, {'client_email': client_b, 'project_name': 'B1'})
         
-        # Verify separation
-        projects_a = client.get_projects_by_client(client_a)
-        projects_b = client.get_projects_by_client(client_b)
-        
-        assert len(projects_a) == 2
-        assert len(projects_b) == 1
-        print("   ✓ Multiple clients' projects properly isolated")
+        # Verify separation; only the tallies matter here
+        assert client.count_projects_by_client(client_a) == 2
+        assert client.count_projects_by_client(client_b) == 1
 
 
 class TestDynamoDBEvents:
     """Test cases for Events table operations (audit log)."""
     
-    def test_create_event(self, dynamodb_setup):
+    def test_create_event(self, dynamodb_setup, db_client):
         """✅ TEST: Create event for project"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Create project first
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
         })
@@ -248,18 +200,17 @@ class TestDynamoDBEvents:
             'subject': 'Project Update',
             'body_preview': 'We need to discuss...'
         }
-        event_id = client.create_event(project_id, event_data)
+        event_id = client.create_event(ORG_ID, project_id, event_data)
         
         assert event_id is not None
         assert len(event_id) > 0
-        print(f"   ✓ Event created: {event_id}")
     
-    def test_get_project_events(self, dynamodb_setup):
+    def test_get_project_events(self, dynamodb_setup, db_client, fake_clock):
         """✅ TEST: Retrieve all events for project"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Create project
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test Project'
         })
@@ -267,67 +218,70 @@ class TestDynamoDBEvents:
         # Create multiple events
         event_types = ['EMAIL_RECEIVED', 'DECISION_MADE', 'SCOPE_CHANGE']
         for event_type in event_types:
-            client.create_event(project_id, {'event_type': event_type})
-            time.sleep(0.01)  # Ensure different timestamps
+            client.create_event(ORG_ID, project_id, {'event_type': event_type})
         
         # Retrieve events
-        events = client.get_project_events(project_id)
+        events = client.get_project_events(ORG_ID, project_id)
         
         assert len(events) == 3, "Should retrieve all 3 events"
         # Events should be in descending order (newest first)
         assert events[0]['event_type'] == 'SCOPE_CHANGE'
         assert events[2]['event_type'] == 'EMAIL_RECEIVED'
-        print(f"   ✓ Retrieved {len(events)} events in chronological order")
     
-    def test_events_chronological_order(self, dynamodb_setup):
+    @pytest.mark.parametrize('n_events', [5, 50, 500])
+    def test_events_chronological_order(self, dynamodb_setup, db_client,
+                                        fake_clock, n_events):
         """✅ TEST: Events are returned in chronological order"""
-        client = DynamoDBClient()
-        
-        project_id = client.create_project({
+        client = db_client
+
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test'
         })
-        
-        # Create events with delays
-        timestamps = []
-        for i in range(5):
-            event_data = {'event_type': f'EVENT_{i}', 'sequence': i}
-            client.create_event(project_id, event_data)
-            time.sleep(0.01)
-        
+
+        # Create events in one batched write; the fake clock keeps their
+        # timestamps distinct. Larger sizes span multiple 25-item
+        # BatchWriteItem chunks on the write side; the read stays one
+        # page under moto, since its pages only split at the 1 MB mark.
+        client.create_events_bulk(ORG_ID, project_id, [
+            {'event_type': f'EVENT_{i}', 'sequence': i}
+            for i in range(n_events)
+        ])
+
         # Retrieve events
-        events = client.get_project_events(project_id)
-        
-        # Verify descending order (newest first)
-        for i in range(len(events) - 1):
-            assert events[i]['event_timestamp'] >= events[i+1]['event_timestamp']
-        
-        print("   ✓ Events in proper chronological order (newest first)")
+        events = client.get_project_events(ORG_ID, project_id, limit=n_events)
+
+        # Verify descending order (newest first); comparing against the
+        # sorted copy runs pairwise checks in C rather than a Python loop
+        assert len(events) == n_events
+        timestamps = [event['event_timestamp'] for event in events]
+        assert timestamps == sorted(timestamps, reverse=True), \
+            "events not in descending order"
     
-    def test_events_limit(self, dynamodb_setup):
+    def test_events_limit(self, dynamodb_setup, db_client):
         """✅ TEST: Limit number of events returned"""
-        client = DynamoDBClient()
+        client = db_client
         
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test'
         })
         
-        # Create many events
-        for i in range(15):
-            client.create_event(project_id, {'event_type': f'EVENT_{i}'})
+        # Create many events in one batched write
+        client.create_events_bulk(ORG_ID, project_id, [
+            {'event_type': f'EVENT_{i}'} for i in range(15)
+        ])
         
         # Retrieve with limit
-        events = client.get_project_events(project_id, limit=5)
+        events = client.get_project_events(ORG_ID, project_id, limit=5)
         
         assert len(events) == 5, "Should respect limit parameter"
-        print("   ✓ Event limit respected")
     
-    def test_event_with_complex_data(self, dynamodb_setup):
+    def test_event_with_complex_data(self, dynamodb_setup, db_client):
         """✅ TEST: Store event with complex AI-extracted data"""
-        client = DynamoDBClient()
+        client = db_client
         
-        project_id = client.create_project({
+        project_id = client.create_project(ORG_ID, {
             'client_email': 'test@example.com',
             'project_name': 'Test'
         })
@@ -350,81 +304,161 @@ class TestDynamoDBEvents:
             'attachments': ['drawing1.pdf', 'specs.docx']
         }
         
-        event_id = client.create_event(project_id, event_data)
+        event_id = client.create_event(ORG_ID, project_id, event_data)
         
         # Retrieve and verify
-        events = client.get_project_events(project_id)
+        events = client.get_project_events(ORG_ID, project_id)
         assert len(events) == 1
         event = events[0]
         assert event['ai_extracted_data']['decisions'][0]['amount'] == 50000
         assert len(event['attachments']) == 2
-        print("   ✓ Complex event data stored correctly")
     
-    def test_events_for_nonexistent_project(self, dynamodb_setup):
+    def test_high_volume_events_round_trip(self, dynamodb_setup, db_client,
+                                           fake_clock):
+        """✅ TEST: Salted writes are readable through every fan-in path"""
+        client = db_client
+
+        project_id = client.create_project(ORG_ID, {
+            'client_email': 'test@example.com',
+            'project_name': 'Busy Project'
+        })
+
+        # Enough events that the salted write spreads across shards
+        client.create_events_bulk(ORG_ID, project_id, [
+            {'event_type': f'EVENT_{i}', 'sequence': i} for i in range(20)
+        ], high_volume=True)
+
+        # Fan-in read merges the shards back into one descending stream
+        events = client.get_project_events(ORG_ID, project_id, limit=20,
+                                           high_volume=True)
+        assert len(events) == 20
+        timestamps = [event['event_timestamp'] for event in events]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+        # Summary projection takes the same shard-aware path
+        summaries = client.list_event_summaries(ORG_ID, project_id, limit=20,
+                                                high_volume=True)
+        assert len(summaries) == 20
+
+        # Detail lookup derives the shard from the summary's timestamp
+        detail = client.get_event_details(
+            ORG_ID, project_id, summaries[0]['event_timestamp'],
+            high_volume=True)
+        assert detail is not None
+        assert detail['event_id'] == events[0]['event_id']
+
+    def test_events_for_nonexistent_project(self, dynamodb_setup, db_client):
         """✅ TEST: Handle events query for non-existent project"""
-        client = DynamoDBClient()
+        client = db_client
         
-        events = client.get_project_events('PROJ-nonexistent')
+        events = client.get_project_events(ORG_ID, 'PROJ-nonexistent')
         
         assert len(events) == 0, "Should return empty list for non-existent project"
-        print("   ✓ Non-existent project events handled gracefully")
+
+
+class TestDynamoDBApiUsage:
+    """Test cases for API usage tracking and daily rollups."""
+
+    def test_track_and_summarize_usage(self, dynamodb_setup, db_client):
+        """✅ TEST: Tracked usage reads back through the rollup summary"""
+        client = db_client
+
+        for model, cost, tokens in [('model-a', '0.50', 1000),
+                                    ('model-a', '0.25', 500),
+                                    ('model-b', '1.00', 2000)]:
+            client.track_api_usage(ORG_ID, {
+                'api_provider': 'test',
+                'model': model,
+                'tokens_used': tokens,
+                'cost_usd': Decimal(cost)
+            })
+
+        summary = client.get_api_usage_summary(ORG_ID, days=1)
+
+        assert summary['total_calls'] == 3
+        assert summary['total_tokens'] == 3500
+        assert summary['total_cost_usd'] == pytest.approx(1.75)
+        breakdown = summary['model_breakdown']
+        assert breakdown['model-a'] == {'cost': 0.75, 'tokens': 1500, 'calls': 2}
+        assert breakdown['model-b'] == {'cost': 1.0, 'tokens': 2000, 'calls': 1}
+
+    def test_summary_includes_pre_rollup_rows(self, dynamodb_setup, db_client):
+        """✅ TEST: Raw rows from before the rollup cutover still count"""
+        client = db_client
+
+        # Simulate a pre-cutover day: raw records exist but no rollup
+        # partition was ever written for them
+        date = time.strftime('%Y-%m-%d')
+        for offset, tokens in enumerate([800, 200]):
+            client.api_usage_table.put_item(Item={
+                'organization_id': ORG_ID,
+                'organization_id_date': f"{ORG_ID}#{date}",
+                'timestamp': int(time.time() * 1000) + offset,
+                'date': date,
+                'model': 'legacy-model',
+                'tokens_used': tokens,
+                'cost_usd': Decimal('0.10')
+            })
+
+        summary = client.get_api_usage_summary(ORG_ID, days=1)
+
+        assert summary['total_calls'] == 2
+        assert summary['total_tokens'] == 1000
+        assert summary['total_cost_usd'] == pytest.approx(0.20)
+        assert summary['model_breakdown']['legacy-model']['calls'] == 2
 
 
 class TestDynamoDBUsers:
     """Test cases for Users table operations."""
     
-    def test_create_user(self, dynamodb_setup):
-        """✅ TEST: Create user account"""
-        client = DynamoDBClient()
-        
-        user_data = {
-            'user_email': 'contractor@example.com',
-            'company_name': 'ABC Construction',
-            'phone': '555-0100'
-        }
+    @pytest.mark.parametrize("user_data, expected_fields", [
+        (
+            {'user_email': 'contractor@example.com', 'organization_id': ORG_ID,
+             'company_name': 'ABC Construction', 'phone': '555-0100'},
+            {'user_email': 'contractor@example.com',
+             'company_name': 'ABC Construction', 'role': 'viewer'},
+        ),
+        (
+            {'user_email': 'simple@example.com', 'organization_id': ORG_ID},
+            {'role': 'viewer'},
+        ),
+        (
+            {'user_email': 'quota@example.com', 'organization_id': ORG_ID,
+             'company_name': 'Quota Test', 'subscription_tier': 'premium',
+             'api_quota': 10000, 'api_usage_current_month': 2500},
+            {'subscription_tier': 'premium', 'api_quota': 10000,
+             'api_usage_current_month': 2500},
+        ),
+    ], ids=['complete', 'minimal', 'quota'])
+    def test_create_user(self, dynamodb_setup, db_client, user_data, expected_fields):
+        """✅ TEST: Create user accounts across representative payloads"""
+        client = db_client
         
         client.create_user(user_data)
         
         # Retrieve and verify
-        user = client.get_user('contractor@example.com')
-        assert user is not None
-        assert user['user_email'] == 'contractor@example.com'
-        assert user['company_name'] == 'ABC Construction'
-        assert user['subscription_tier'] == 'free'  # Default
-        assert user['api_quota'] == 1000  # Default
-        print(f"   ✓ User created: {user['user_email']}")
-    
-    def test_create_user_minimal(self, dynamodb_setup):
-        """✅ TEST: Create user with minimal data"""
-        client = DynamoDBClient()
-        
-        user_data = {
-            'user_email': 'simple@example.com'
-        }
-        
-        client.create_user(user_data)
-        user = client.get_user('simple@example.com')
-        
+        user = client.get_user(user_data['user_email'])
         assert user is not None
         assert 'created_at' in user
-        print("   ✓ Minimal user created with defaults")
+        for field, expected in expected_fields.items():
+            assert user[field] == expected
     
-    def test_create_user_no_email(self, dynamodb_setup):
+    def test_create_user_no_email(self, dynamodb_setup, db_client):
         """✅ TEST: Handle user creation without email"""
-        client = DynamoDBClient()
+        client = db_client
         
         with pytest.raises(ValueError):
-            client.create_user({'company_name': 'No Email Company'})
-        
-        print("   ✓ User creation without email raises error")
+            client.create_user({'company_name': 'No Email Company',
+                                'organization_id': ORG_ID})
     
-    def test_get_user(self, dynamodb_setup):
+    def test_get_user(self, dynamodb_setup, db_client):
         """✅ TEST: Retrieve existing user"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Create user
         client.create_user({
             'user_email': 'test@example.com',
+            'organization_id': ORG_ID,
             'company_name': 'Test Company'
         })
         
@@ -434,30 +468,30 @@ class TestDynamoDBUsers:
         assert user is not None
         assert user['user_email'] == 'test@example.com'
         assert user['company_name'] == 'Test Company'
-        print("   ✓ User retrieved successfully")
     
-    def test_get_user_not_found(self, dynamodb_setup):
+    def test_get_user_not_found(self, dynamodb_setup, db_client):
         """✅ TEST: Handle non-existent user"""
-        client = DynamoDBClient()
+        client = db_client
         
         user = client.get_user('nonexistent@example.com')
         
         assert user is None, "Should return None for non-existent user"
-        print("   ✓ Non-existent user handled gracefully")
     
-    def test_update_user_via_put(self, dynamodb_setup):
+    def test_update_user_via_put(self, dynamodb_setup, db_client):
         """✅ TEST: Update user by putting new data"""
-        client = DynamoDBClient()
+        client = db_client
         
         # Create user
         client.create_user({
             'user_email': 'update@example.com',
+            'organization_id': ORG_ID,
             'company_name': 'Original Company'
         })
         
         # Update user (put_item overwrites)
         client.create_user({
             'user_email': 'update@example.com',
+            'organization_id': ORG_ID,
             'company_name': 'Updated Company',
             'subscription_tier': 'premium'
         })
@@ -466,46 +500,28 @@ class TestDynamoDBUsers:
         user = client.get_user('update@example.com')
         assert user['company_name'] == 'Updated Company'
         assert user['subscription_tier'] == 'premium'
-        print("   ✓ User updated successfully")
     
-    def test_multiple_users(self, dynamodb_setup):
+    def test_multiple_users(self, dynamodb_setup, db_client):
         """✅ TEST: Create and manage multiple users"""
-        client = DynamoDBClient()
+        client = db_client
         
         users = [
-            {'user_email': 'user1@example.com', 'company_name': 'Company 1'},
-            {'user_email': 'user2@example.com', 'company_name': 'Company 2'},
-            {'user_email': 'user3@example.com', 'company_name': 'Company 3'},
+            {'user_email': 'user1@example.com', 'organization_id': ORG_ID,
+             'company_name': 'Company 1'},
+            {'user_email': 'user2@example.com', 'organization_id': ORG_ID,
+             'company_name': 'Company 2'},
+            {'user_email': 'user3@example.com', 'organization_id': ORG_ID,
+             'company_name': 'Company 3'},
         ]
         
-        # Create all users
-        for user_data in users:
-            client.create_user(user_data)
+        # Create all users in one batched write
+        client.create_users_bulk(users)
         
         # Verify each exists
         for user_data in users:
             user = client.get_user(user_data['user_email'])
             assert user is not None
             assert user['company_name'] == user_data['company_name']
-        
-        print(f"   ✓ Created and verified {len(users)} users")
-    
-    def test_user_with_quota_tracking(self, dynamodb_setup):
-        """✅ TEST: User with API quota tracking"""
-        client = DynamoDBClient()
-        
-        client.create_user({
-            'user_email': 'quota@example.com',
-            'company_name': 'Quota Test',
-            'subscription_tier': 'premium',
-            'api_quota': 10000,
-            'api_usage_current_month': 2500
-        })
-        
-        user = client.get_user('quota@example.com')
-        assert user['api_quota'] == 10000
-        assert user['api_usage_current_month'] == 2500
-        print("   ✓ User quota tracking works")
 
 
 if __name__ == '__main__':
@@ -4,24 +4,29 @@ Tests: email storage, attachment handling, presigned URLs
 """
 import pytest
 import boto3
-from moto import mock_s3
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
-
 from shared.s3_client import S3Client
 from shared.config import Config
+from conftest import wipe_bucket
+
+
+@pytest.fixture(scope="module")
+def _bucket(_moto_s3):
+    """Create the mock bucket once per module on the shared S3 backend."""
+    s3_client = boto3.client('s3', region_name='us-east-1')
+    s3_client.create_bucket(Bucket=Config.EMAIL_BUCKET)
+    yield s3_client
+    wipe_bucket(Config.EMAIL_BUCKET)
+    s3_client.delete_bucket(Bucket=Config.EMAIL_BUCKET)
 
 
 @pytest.fixture
-def s3_setup():
-    """Set up mock S3 bucket."""
-    with mock_s3():
-        # Create mock bucket
-        s3_client = boto3.client('s3', region_name='us-east-1')
-        s3_client.create_bucket(Bucket=Config.EMAIL_BUCKET)
-        yield s3_client
+def s3_setup(_bucket):
+    """Per-test view of the shared bucket; objects are wiped afterwards."""
+    yield _bucket
+    wipe_bucket(Config.EMAIL_BUCKET)
 
 
 class TestS3Client:
@@ -43,7 +48,6 @@ class TestS3Client:
         
         # Verify
         assert result == test_email, "Email content should match"
-        print("   ✓ Email retrieved successfully")
     
     def test_get_email_not_found(self, s3_setup):
         """✅ TEST: Handle missing email gracefully"""
@@ -51,8 +55,6 @@ class TestS3Client:
         
         with pytest.raises(Exception):
             client.get_email('emails/nonexistent')
-        
-        print("   ✓ Properly handles missing email")
     
     def test_store_attachment_pdf(self, s3_setup):
         """✅ TEST: Store PDF attachment"""
@@ -74,8 +76,6 @@ class TestS3Client:
         assert stored_data['Body'].read() == pdf_data, "PDF data should match"
         assert stored_data['ContentType'] == 'application/pdf', "Content type should be correct"
         assert stored_data['ServerSideEncryption'] == 'AES256', "Should be encrypted"
-        
-        print("   ✓ PDF attachment stored with encryption")
     
     def test_store_attachment_image(self, s3_setup):
         """✅ TEST: Store image attachment"""
@@ -89,7 +89,6 @@ class TestS3Client:
         )
         
         assert 'attachments/' in key
-        print("   ✓ Image attachment stored successfully")
     
     def test_store_attachment_docx(self, s3_setup):
         """✅ TEST: Store DOCX attachment"""
@@ -103,7 +102,6 @@ class TestS3Client:
         )
         
         assert key is not None
-        print("   ✓ DOCX attachment stored successfully")
     
     def test_get_attachment(self, s3_setup):
         """✅ TEST: Retrieve attachment from S3"""
@@ -117,7 +115,6 @@ class TestS3Client:
         retrieved = client.get_attachment(key)
         
         assert retrieved == test_data, "Retrieved data should match stored data"
-        print("   ✓ Attachment retrieved correctly")
     
     def test_get_attachment_not_found(self, s3_setup):
         """✅ TEST: Handle missing attachment"""
@@ -125,8 +122,6 @@ class TestS3Client:
         
         with pytest.raises(Exception):
             client.get_attachment('attachments/missing.pdf')
-        
-        print("   ✓ Properly handles missing attachment")
     
     def test_generate_presigned_url(self, s3_setup):
         """✅ TEST: Generate presigned URL for download"""
@@ -142,7 +137,6 @@ class TestS3Client:
         assert url is not None
         assert Config.EMAIL_BUCKET in url
         assert key in url
-        print("   ✓ Presigned URL generated successfully")
     
     def test_generate_presigned_url_custom_expiration(self, s3_setup):
         """✅ TEST: Generate presigned URL with custom expiration"""
@@ -154,7 +148,6 @@ class TestS3Client:
         url = client.generate_presigned_url(key, expiration=7200)
         
         assert url is not None
-        print("   ✓ Custom expiration URL generated")
     
     def test_large_file_storage(self, s3_setup):
         """✅ TEST: Store large file (simulated)"""
@@ -167,7 +160,6 @@ class TestS3Client:
         # Verify
         retrieved = client.get_attachment(key)
         assert len(retrieved) == len(large_data), "Large file should be stored completely"
-        print("   ✓ Large file (5MB) stored successfully")
     
     def test_multiple_attachments_same_project(self, s3_setup):
         """✅ TEST: Store multiple attachments for same project"""
@@ -178,15 +170,15 @@ class TestS3Client:
             ('project-123/drawing2.pdf', b'drawing 2', 'application/pdf'),
             ('project-123/specs.docx', b'specs', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
         ]
-        
-        keys = []
-        for filename, data, content_type in attachments:
-            key = client.store_attachment(filename, data, content_type)
-            keys.append(key)
-        
+
+        # Batch API uploads the three concurrently through the shared pool
+        keys = client.store_attachments_batch([
+            {'key': filename, 'data': data, 'content_type': content_type}
+            for filename, data, content_type in attachments
+        ])
+
         assert len(keys) == 3, "All attachments should be stored"
         assert all('project-123' in k for k in keys), "All keys should reference project"
-        print("   ✓ Multiple attachments stored for same project")
     
     def test_special_characters_in_filename(self, s3_setup):
         """✅ TEST: Handle special characters in filenames"""
@@ -202,7 +194,6 @@ class TestS3Client:
         # Should be able to retrieve
         data = client.get_attachment(key)
         assert data == b'drawing data'
-        print("   ✓ Special characters in filename handled")
 
 
 if __name__ == '__main__':